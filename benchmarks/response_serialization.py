@@ -0,0 +1,72 @@
+"""Compare list response serialization paths on a page of 10k parts.
+
+Run from the repository root with the test dependencies installed:
+
+    PYTHONPATH=src python benchmarks/response_serialization.py
+"""
+
+import asyncio
+import timeit
+from typing import Any, Callable, Dict, List
+
+from beanie import PydanticObjectId, init_beanie
+from fastapi.responses import JSONResponse
+from mongomock_motor import AsyncMongoMockClient
+
+import core.models as models
+from core.models.part import Part
+from core.responses import ModelResponse
+
+PARTS: int = 10_000
+ROUNDS: int = 20
+
+
+def build_parts(count: int) -> List[Part]:
+    return [
+        Part.model_validate(
+            {
+                "_id": PydanticObjectId(),
+                "serial_number": f"SN{index:08d}",
+                "name": f"Part {index}",
+                "description": "Hex bolt, zinc plated, DIN 933",
+                "category": "Bolts",
+                "quantity": index % 500,
+                "price": index / 100,
+                "location": {"room": "A1", "bookcase": index % 40, "shelf": "3"},
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def json_response(parts: List[Part]) -> bytes:
+    return JSONResponse(
+        {"data": [part.model_dump() for part in parts], "next_cursor": None}
+    ).body
+
+
+def model_response(parts: List[Part]) -> bytes:
+    return ModelResponse({"data": parts, "next_cursor": None}).body
+
+
+async def main() -> None:
+    await init_beanie(
+        database=AsyncMongoMockClient()["benchmark"], document_models=models.__all__
+    )
+    parts: List[Part] = build_parts(PARTS)
+    assert json_response(parts) == model_response(parts)
+    candidates: Dict[str, Callable[[List[Part]], Any]] = {
+        "model_dump + JSONResponse": json_response,
+        "ModelResponse": model_response,
+    }
+    timings: Dict[str, float] = {
+        name: min(timeit.repeat(lambda: render(parts), number=1, repeat=ROUNDS))
+        for name, render in candidates.items()
+    }
+    baseline: float = timings["model_dump + JSONResponse"]
+    for name, seconds in timings.items():
+        print(f"{name:<28} {seconds * 1000:8.1f} ms  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import List
 
@@ -5,10 +6,19 @@ from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .auth.jwt_handler import AuthHandler
+from .cache.category_tree import category_tree
+from .cache.response_cache import response_cache
+from .cache.revocation import revocation_list
+from .cache.serial_index import serial_index
+from .cache.token_cache import token_cache
+from .compression import CompressionMiddleware
+from .config import settings
 from .database import Database
+from .models.category import Category
 from .routes.auth_routes import router as AuthRouter
 from .routes.category_routes import router as CategoryRouter
 from .routes.part_routes import router as PartsRouter
+from .routes.report_routes import router as ReportRouter
 from .routes.search_routes import router as SearchRouter
 
 db: Database = Database()
@@ -19,7 +29,31 @@ auth_handler: AuthHandler = AuthHandler()
 async def lifespan(fastapi: FastAPI):
     print("Initializing database...")
     await db.init_db()
+    print("Building serial number index...")
+    await serial_index.load()
+    print("Backfilling category counters...")
+    await Category.rebuild_counters({"part_count": {"$exists": False}})
+    print("Loading category tree...")
+    await category_tree.load()
+    background_tasks: List[asyncio.Task] = [
+        asyncio.create_task(category_tree.watch()),
+        asyncio.create_task(
+            serial_index.reload_periodically(settings.SERIAL_INDEX_RELOAD_SECONDS)
+        ),
+    ]
+    if settings.STATELESS_TOKENS:
+        print("Loading revocation list...")
+        await revocation_list.refresh()
+        background_tasks.append(
+            asyncio.create_task(
+                revocation_list.refresh_periodically(
+                    settings.REVOCATION_REFRESH_SECONDS
+                )
+            )
+        )
     yield
+    for task in background_tasks:
+        task.cancel()
     print("Closing connection...")
     db.close_db()
 
@@ -32,6 +66,12 @@ origins: List[str] = [
     "http://localhost:8080",
 ]
 
+app.add_middleware(
+    CompressionMiddleware,  # type: ignore
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    compresslevel=settings.COMPRESSION_LEVEL,
+)
 app.add_middleware(
     CORSMiddleware,  # type: ignore
     allow_origins=origins,
@@ -58,9 +98,23 @@ app.include_router(
     prefix="/search",
     dependencies=[Depends(auth_handler.verify_token)],
 )
+app.include_router(
+    ReportRouter,
+    tags=["Report"],
+    prefix="/reports",
+    dependencies=[Depends(auth_handler.verify_token)],
+)
 app.include_router(AuthRouter, tags=["Auth"], prefix="/auth")
 
 
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "Parts warehouse API"}
+
+
+@app.get("/metrics", tags=["Root"], dependencies=[Depends(auth_handler.verify_token)])
+async def read_metrics():
+    return {
+        "token_cache": token_cache.stats(),
+        "response_cache": response_cache.stats(),
+    }
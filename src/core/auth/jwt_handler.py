@@ -1,14 +1,22 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Any, Dict
+from typing import Annotated, Any, Callable, Dict, Tuple, TypeVar
 
 from beanie import PydanticObjectId
-from fastapi import Depends, HTTPException
+from bson.errors import InvalidId
+from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from passlib.context import CryptContext
 
+from ..cache.revocation import revocation_list
+from ..cache.token_cache import token_cache
 from ..config import settings
-from ..models.auth.user import User
+from ..models.auth.user import User, UserView
+
+ResultType = TypeVar("ResultType")
 
 
 class AuthHandler:
@@ -17,6 +25,14 @@ class AuthHandler:
     algorithm: str = settings.JWT_ALGORITHM
     expire: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES
     oauth2_bearer: OAuth2PasswordBearer = OAuth2PasswordBearer(tokenUrl="/auth/token")
+    hash_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+    )
+    hash_capacity: int = (
+        settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+    )
+    pending_hashes: int = 0
+    user_claims: Tuple[str, ...] = ("username", "email")
 
     def get_password_hash(self, password: str) -> str:
         return self.pwd_context.hash(password)
@@ -24,8 +40,36 @@ class AuthHandler:
     def verify_password(self, password: str, hashed_password: str) -> bool:
         return self.pwd_context.verify(password, hashed_password)
 
+    async def get_password_hash_async(self, password: str) -> str:
+        return await self._run_hashing(self.get_password_hash, password)
+
+    async def verify_password_async(self, password: str, hashed_password: str) -> bool:
+        return await self._run_hashing(self.verify_password, password, hashed_password)
+
+    async def _run_hashing(
+        self, function: Callable[..., ResultType], *args: Any
+    ) -> ResultType:
+        # bcrypt takes hundreds of milliseconds, keep it off the event loop and
+        # shed load once the pool and its queue are full
+        if AuthHandler.pending_hashes >= self.hash_capacity:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, try again later",
+                headers={"Retry-After": "1"},
+            )
+        AuthHandler.pending_hashes += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.hash_executor, function, *args
+            )
+        finally:
+            AuthHandler.pending_hashes -= 1
+
     def encode_token(
-        self, user_id: PydanticObjectId, expire_time: int | None = None
+        self,
+        user_id: PydanticObjectId,
+        expire_time: int | None = None,
+        claims: Dict[str, Any] | None = None,
     ) -> str:
         if expire_time:
             expire: datetime = datetime.now(timezone.utc) + timedelta(
@@ -36,20 +80,58 @@ class AuthHandler:
                 minutes=self.expire
             )
         payload: Dict[str, Any] = {
+            **(claims or {}),
             "user_id": user_id.__str__(),
             "exp": expire,
         }
         return jwt.encode(payload, self.secret, algorithm=self.algorithm)
 
-    async def verify_token(self, token: Annotated[str, Depends(oauth2_bearer)]) -> User:
+    async def verify_token(
+        self, token: Annotated[str, Depends(oauth2_bearer)]
+    ) -> UserView:
+        if settings.STATELESS_TOKENS:
+            return await self._verify_token_claims(token)
+        cached_user: UserView | None = token_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+        payload: Dict[str, Any] = self._decode_token(token)
+        user: UserView = await self._get_user(payload)
+        token_cache.set(token, user, ttl=payload["exp"] - time.time())
+        return user
+
+    async def _verify_token_claims(self, token: str) -> UserView:
+        # Trust a valid signature and only consult the in-memory revocation list
+        payload: Dict[str, Any] = self._decode_token(token)
+        if revocation_list.is_revoked(payload["user_id"]):
+            raise HTTPException(
+                status_code=401, detail="Could not verify token for this user"
+            )
+        if not all(claim in payload for claim in self.user_claims):
+            return await self._get_user(payload)
+        return UserView(
+            id=payload["user_id"],
+            **{claim: payload[claim] for claim in self.user_claims},
+        )
+
+    def _decode_token(self, token: str) -> Dict[str, Any]:
         try:
             payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
-            user_id: str = payload["user_id"]
+            payload["user_id"] = PydanticObjectId(payload["user_id"])
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Signature has expired")
         except jwt.JWTError as e:
             raise HTTPException(status_code=401, detail=e.__str__())
-        user: User = await User.get(user_id)
+        except (InvalidId, KeyError, TypeError):
+            raise HTTPException(
+                status_code=401, detail="Could not verify token for this user"
+            )
+        return payload
+
+    async def _get_user(self, payload: Dict[str, Any]) -> UserView:
+        user: UserView | None = await User.find_one(
+            {"_id": payload["user_id"], "disabled": {"$ne": True}},
+            projection_model=UserView,
+        )
         if not user:
             raise HTTPException(
                 status_code=401, detail="Could not verify token for this user"
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Set
+
+from pymongo import UpdateOne
+
+from .cache.response_cache import response_cache
+from .models.category import Category
+from .models.collection_version import CollectionVersion
+
+CounterDeltas = Dict[str, Dict[Optional[str], int]]
+
+
+async def record_write(
+    collections: Iterable[str], counter_deltas: Optional[CounterDeltas] = None
+) -> None:
+    """Record a finished write to `collections` for ETags and category counters.
+
+    `counter_deltas` maps a category counter to the change of each category.
+    Categories count as changed when any counter moves. The counter updates and
+    the single version bump of every changed collection run concurrently, so a
+    write pays one extra round trip for all of its bookkeeping.
+    """
+    operations: List[UpdateOne] = [
+        UpdateOne({"name": name}, {"$inc": {counter: delta}})
+        for counter, deltas in (counter_deltas or {}).items()
+        for name, delta in deltas.items()
+        if name is not None and delta
+    ]
+    names: Set[str] = set(collections)
+    writes: List[Awaitable[Any]] = []
+    if operations:
+        names.add(Category.get_collection_name())
+        writes.append(
+            Category.get_motor_collection().bulk_write(operations, ordered=False)
+        )
+    if names:
+        writes.append(CollectionVersion.bump(*sorted(names)))
+    await asyncio.gather(*writes)
+    if operations:
+        await response_cache.clear(Category.get_collection_name())
@@ -0,0 +1,193 @@
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pydantic import ValidationError
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+from pymongo.results import DeleteResult, UpdateResult
+
+from .bookkeeping import record_write
+from .cache.category_tree import CategoryNode, category_tree
+from .cache.response_cache import response_cache
+from .cache.serial_index import serial_index
+from .config import settings
+from .models.part import Part, part_category_error, validate_part_category
+
+
+async def insert_parts(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate and insert `rows` as parts, returning one result per row.
+
+    Categories are checked for the whole batch at once and valid rows are
+    written with a single unordered `insert_many`, so one bad row never blocks
+    the rest of the batch.
+    """
+    results: List[Dict[str, Any]] = []
+    parts: Dict[int, Part] = _validate_rows(rows, results)
+    parts = await _check_categories(parts, results)
+    await _write_parts(parts, results)
+    return results
+
+
+def _validate_rows(
+    rows: List[Dict[str, Any]], results: List[Dict[str, Any]]
+) -> Dict[int, Part]:
+    parts: Dict[int, Part] = {}
+    for index, row in enumerate(rows):
+        try:
+            part: Part = Part.model_validate(row)
+        except ValidationError as e:
+            results.append(
+                _error(
+                    index,
+                    e.errors(
+                        include_url=False, include_context=False, include_input=False
+                    ),
+                )
+            )
+            continue
+        part.id = PydanticObjectId()
+        results.append({"index": index, "status": "created", "id": str(part.id)})
+        parts[index] = part
+    return parts
+
+
+async def _check_categories(
+    parts: Dict[int, Part], results: List[Dict[str, Any]]
+) -> Dict[int, Part]:
+    categories: Dict[str, CategoryNode] = await category_tree.get_many(
+        {part.category for part in parts.values()}
+    )
+    valid_parts: Dict[int, Part] = {}
+    for position, part in parts.items():
+        detail: Optional[str] = part_category_error(
+            part.category, categories.get(part.category)
+        )
+        if detail is None:
+            valid_parts[position] = part
+        else:
+            results[position] = _error(position, detail)
+    return valid_parts
+
+
+async def _write_parts(parts: Dict[int, Part], results: List[Dict[str, Any]]) -> None:
+    if not parts:
+        return
+    positions: List[int] = list(parts)
+    try:
+        await Part.insert_many(list(parts.values()), ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details["writeErrors"]:
+            position: int = positions[write_error["index"]]
+            results[position] = _error(position, _write_error(write_error))
+    inserted: List[Part] = [
+        part
+        for position, part in parts.items()
+        if results[position]["status"] == "created"
+    ]
+    if not inserted:
+        return
+    serial_index.add_many(part.serial_number for part in inserted)
+    await record_write(
+        [Part.get_collection_name()],
+        {"part_count": Counter(part.category for part in inserted)},
+    )
+
+
+async def update_parts(
+    query: Dict[str, Any], update: Dict[str, Any], category: Optional[str]
+) -> Tuple[int, int]:
+    """Apply `update` to every part matching `query`, returning matched and modified.
+
+    When parts move to another category, the affected parts are read and
+    updated `BULK_WRITE_BATCH_SIZE` at a time so the category part counters can
+    be adjusted exactly without building an unbounded id list.
+    """
+    matched: int
+    modified: int
+    deltas: Counter = Counter()
+    if category is None:
+        result: UpdateResult = await Part.get_motor_collection().update_many(
+            query, update
+        )
+        matched, modified = result.matched_count, result.modified_count
+    else:
+        matched, modified, deltas = await _move_parts(query, update, category)
+    if modified:
+        await record_write([Part.get_collection_name()], {"part_count": deltas})
+        await response_cache.clear(Part.get_collection_name())
+    return matched, modified
+
+
+async def _move_parts(
+    query: Dict[str, Any], update: Dict[str, Any], category: str
+) -> Tuple[int, int, Counter]:
+    await validate_part_category(category)
+    matched: int = 0
+    modified: int = 0
+    deltas: Counter = Counter()
+    async for chunk in _iter_chunks(query, {"_id": 1, "category": 1}):
+        result: UpdateResult = await Part.get_motor_collection().update_many(
+            {"_id": {"$in": [document["_id"] for document in chunk]}}, update
+        )
+        matched += result.matched_count
+        modified += result.modified_count
+        for document in chunk:
+            if document["category"] != category:
+                deltas[document["category"]] -= 1
+                deltas[category] += 1
+    return matched, modified, deltas
+
+
+async def delete_parts(query: Dict[str, Any]) -> int:
+    deleted: int = 0
+    removed: Counter = Counter()
+    async for chunk in _iter_chunks(
+        query, {"_id": 1, "category": 1, "serial_number": 1}
+    ):
+        result: DeleteResult = await Part.get_motor_collection().delete_many(
+            {"_id": {"$in": [document["_id"] for document in chunk]}}
+        )
+        deleted += result.deleted_count
+        removed.update(document["category"] for document in chunk)
+        serial_index.remove_many(document["serial_number"] for document in chunk)
+        await response_cache.delete(
+            Part.get_collection_name(), [str(document["_id"]) for document in chunk]
+        )
+    if removed:
+        await record_write(
+            [Part.get_collection_name()],
+            {"part_count": {category: -count for category, count in removed.items()}},
+        )
+    return deleted
+
+
+async def _iter_chunks(
+    query: Dict[str, Any], projection: Dict[str, Any]
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    batch_size: int = settings.BULK_WRITE_BATCH_SIZE
+    chunk: List[Dict[str, Any]] = []
+    async for document in (
+        Part.get_motor_collection()
+        .find(query, projection, batch_size=batch_size)
+        .sort("_id", ASCENDING)
+    ):
+        chunk.append(document)
+        if len(chunk) == batch_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_error(write_error: Dict[str, Any]) -> str:
+    if write_error["code"] == 11000:
+        key_value: Any = write_error.get("keyValue") or {
+            "serial_number": write_error["op"].get("serial_number")
+        }
+        return f"Part with {key_value} already exists"
+    return write_error["errmsg"]
+
+
+def _error(index: int, detail: Any) -> Dict[str, Any]:
+    return {"index": index, "status": "error", "detail": detail}
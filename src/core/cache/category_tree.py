@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import Any, Collection, Dict, List, NamedTuple, Optional, Set
+
+from ..config import settings
+
+
+class CategoryNode(NamedTuple):
+    name: str
+    parent_name: Optional[str]
+
+    @property
+    def is_base(self) -> bool:
+        return self.parent_name is None
+
+
+class CategoryTree:
+    """In-process copy of the category hierarchy used by validation hooks.
+
+    Category writes in this process invalidate it immediately; writes made by
+    other workers are picked up through a change stream when the deployment
+    supports one, and otherwise after `ttl` seconds at the latest.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl: float = ttl
+        self._parents: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._version: int = 0
+        self._loaded_version: int = -1
+        self._loaded_at: float = 0.0
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        async with self._lock:
+            await self._load()
+
+    async def _load(self) -> None:
+        from ..models.category import Category
+
+        version: int = self._version
+        parents: Dict[str, Optional[str]] = {}
+        children: Dict[str, Set[str]] = {}
+        async for document in Category.get_motor_collection().find(
+            {}, {"_id": 0, "name": 1, "parent_name": 1}
+        ):
+            _add(parents, children, document)
+        # Readers keep the previous tree until the new one is complete
+        self._parents, self._children = parents, children
+        self._loaded_version = version
+        self._loaded_at = time.monotonic()
+
+    async def _refresh(self) -> None:
+        if not self._is_stale():
+            return
+        async with self._lock:
+            # Callers that waited for a reload in progress reuse its result
+            if self._is_stale():
+                await self._load()
+
+    def invalidate(self) -> None:
+        self._version += 1
+
+    async def get(self, name: str) -> Optional[CategoryNode]:
+        await self._refresh()
+        if name not in self._parents and not await self._load_missing(name):
+            return None
+        return CategoryNode(name, self._parents[name])
+
+    async def get_many(self, names: Collection[str]) -> Dict[str, CategoryNode]:
+        await self._refresh()
+        missing: List[str] = [name for name in names if name not in self._parents]
+        if missing:
+            await self._load_missing(*missing)
+        return {
+            name: CategoryNode(name, self._parents[name])
+            for name in names
+            if name in self._parents
+        }
+
+    async def children(self, name: str) -> Set[str]:
+        await self._refresh()
+        return set(self._children.get(name, ()))
+
+    async def watch(self) -> None:
+        from ..models.category import Category
+
+        try:
+            async with Category.get_motor_collection().watch() as stream:
+                async for _ in stream:
+                    self.invalidate()
+        except Exception as e:
+            print(f"Category change stream unavailable, using TTL only: {e}")
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_version != self._version
+            or time.monotonic() - self._loaded_at > self.ttl
+        )
+
+    async def _load_missing(self, *names: str) -> bool:
+        # Categories created by other workers are fetched on first use
+        from ..models.category import Category
+
+        found: bool = False
+        async for document in Category.get_motor_collection().find(
+            {"name": {"$in": list(names)}}, {"_id": 0, "name": 1, "parent_name": 1}
+        ):
+            _add(self._parents, self._children, document)
+            found = True
+        return found
+
+
+def _add(
+    parents: Dict[str, Optional[str]],
+    children: Dict[str, Set[str]],
+    document: Dict[str, Any],
+) -> None:
+    parent_name: Optional[str] = document.get("parent_name")
+    parents[document["name"]] = parent_name
+    if parent_name is not None:
+        children.setdefault(parent_name, set()).add(document["name"])
+
+
+category_tree: CategoryTree = CategoryTree(ttl=settings.CATEGORY_CACHE_TTL)
@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..config import settings
+from .ttl import TTLCache
+
+CachedResponse = Tuple[bytes, str]
+
+
+class ResponseCacheBackend(ABC):
+    """Storage for serialized responses and their ETags, grouped by namespace.
+
+    The default backend keeps entries in process, so every uvicorn worker has
+    its own copy and only the TTL bounds how long other workers serve a stale
+    response. A backend over a shared store keeps all workers coherent.
+    """
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: CachedResponse) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self, namespace: str) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        ...
+
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._caches: Dict[str, TTLCache[str, CachedResponse]] = {}
+
+    def _cache(self, namespace: str) -> TTLCache[str, CachedResponse]:
+        if namespace not in self._caches:
+            self._caches[namespace] = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        return self._caches[namespace]
+
+    async def get(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        return self._cache(namespace).get(key)
+
+    async def set(self, namespace: str, key: str, value: CachedResponse) -> None:
+        self._cache(namespace).set(key, value)
+
+    async def delete(self, namespace: str, keys: Iterable[str]) -> None:
+        cache: TTLCache[str, CachedResponse] = self._cache(namespace)
+        for key in keys:
+            cache.pop(key)
+
+    async def clear(self, namespace: str) -> None:
+        self._cache(namespace).clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {namespace: cache.stats() for namespace, cache in self._caches.items()}
+
+
+response_cache: ResponseCacheBackend = MemoryResponseCacheBackend(
+    maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL
+)
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Set
+
+from beanie import PydanticObjectId
+
+
+class RevocationList:
+    """Users whose tokens must be refused while tokens are verified statelessly.
+
+    Disabled and deleted users are reloaded from Mongo periodically, so every
+    worker learns about them within one refresh interval. Deletions are kept in
+    the revoked_users collection until any token issued before them expires.
+    """
+
+    def __init__(self) -> None:
+        self._disabled: Set[PydanticObjectId] = set()
+        self._deleted: Set[PydanticObjectId] = set()
+
+    def is_revoked(self, user_id: PydanticObjectId) -> bool:
+        return user_id in self._disabled or user_id in self._deleted
+
+    def set_disabled(self, user_id: PydanticObjectId, disabled: bool) -> None:
+        if disabled:
+            self._disabled.add(user_id)
+        else:
+            self._disabled.discard(user_id)
+
+    def add_deleted(self, user_id: PydanticObjectId) -> None:
+        self._deleted.add(user_id)
+
+    async def refresh(self) -> None:
+        from ..models.auth.revoked_user import RevokedUser
+        from ..models.auth.user import User
+
+        self._disabled = {
+            document["_id"]
+            async for document in User.get_motor_collection().find(
+                {"disabled": True}, {"_id": 1}
+            )
+        }
+        self._deleted = {
+            document["_id"]
+            async for document in RevokedUser.get_motor_collection().find(
+                {}, {"_id": 1}
+            )
+        }
+
+    async def refresh_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Could not refresh revocation list: {e}")
+
+
+revocation_list: RevocationList = RevocationList()
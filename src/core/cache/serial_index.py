@@ -0,0 +1,96 @@
+import asyncio
+from bisect import bisect_left
+from typing import Iterable, List, Set
+
+from ..models.part import Part
+
+
+class SerialNumberIndex:
+    """Sorted in-process copy of every part serial number for prefix lookups.
+
+    Writes made by this process update the copy directly. It is also reloaded
+    from Mongo periodically, so changes made by other workers or by the import
+    CLI show up within one reload interval.
+    """
+
+    def __init__(self) -> None:
+        self._serial_numbers: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._serial_numbers)
+
+    async def load(self) -> None:
+        serial_numbers: List[str] = [
+            document["serial_number"]
+            async for document in Part.get_motor_collection().find(
+                {}, {"_id": 0, "serial_number": 1}
+            )
+        ]
+        serial_numbers.sort()
+        self._serial_numbers = serial_numbers
+
+    async def reload_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except Exception as e:
+                print(f"Could not reload serial number index: {e}")
+
+    def add(self, serial_number: str) -> None:
+        position: int = bisect_left(self._serial_numbers, serial_number)
+        if self._at(position) != serial_number:
+            self._serial_numbers.insert(position, serial_number)
+
+    def remove(self, serial_number: str) -> None:
+        position: int = bisect_left(self._serial_numbers, serial_number)
+        if self._at(position) == serial_number:
+            del self._serial_numbers[position]
+
+    def add_many(self, serial_numbers: Iterable[str]) -> None:
+        added: List[str] = sorted(
+            {
+                serial_number
+                for serial_number in serial_numbers
+                if not self._contains(serial_number)
+            }
+        )
+        if added:
+            # Both runs are sorted, so the sort is a single merge pass
+            self._serial_numbers = sorted(self._serial_numbers + added)
+
+    def remove_many(self, serial_numbers: Iterable[str]) -> None:
+        removed: Set[str] = set(serial_numbers)
+        if removed:
+            self._serial_numbers = [
+                serial_number
+                for serial_number in self._serial_numbers
+                if serial_number not in removed
+            ]
+
+    def replace(self, old_serial_number: str, new_serial_number: str) -> None:
+        self.remove(old_serial_number)
+        self.add(new_serial_number)
+
+    def complete(self, prefix: str, limit: int) -> List[str]:
+        matches: List[str] = []
+        start: int = bisect_left(self._serial_numbers, prefix)
+        end: int = start + limit
+        for serial_number in self._serial_numbers[start:end]:
+            if not serial_number.startswith(prefix):
+                break
+            matches.append(serial_number)
+        return matches
+
+    def _contains(self, serial_number: str) -> bool:
+        return (
+            self._at(bisect_left(self._serial_numbers, serial_number)) == serial_number
+        )
+
+    def _at(self, position: int) -> str:
+        if position < len(self._serial_numbers):
+            return self._serial_numbers[position]
+        return ""
+
+
+serial_index: SerialNumberIndex = SerialNumberIndex()
@@ -0,0 +1,12 @@
+from beanie import PydanticObjectId
+
+from ..config import settings
+from .ttl import TTLCache
+
+token_cache: TTLCache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL
+)
+
+
+def invalidate_user(user_id: PydanticObjectId) -> None:
+    token_cache.pop_where(lambda user: user.id == user_id)
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[KeyType, ValueType]):
+    """Bounded LRU mapping whose entries also expire after a time to live."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[KeyType, Tuple[float, ValueType]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyType) -> Optional[ValueType]:
+        entry: Optional[Tuple[float, ValueType]] = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: KeyType, value: ValueType, ttl: Optional[float] = None) -> None:
+        lifetime: float = self.ttl if ttl is None else min(ttl, self.ttl)
+        expires_at: float = time.monotonic() + lifetime
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: KeyType) -> None:
+        self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[ValueType], bool]) -> None:
+        for key in [
+            key for key, (_, value) in self._entries.items() if predicate(value)
+        ]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups: int = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,130 @@
+import zlib
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Media types whose bodies are compressed already and would not shrink
+COMPRESSED_MEDIA_TYPES: tuple = (
+    "application/gzip",
+    "application/zip",
+    "image/",
+    "video/",
+    "audio/",
+)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    qualities: Dict[str, float] = {}
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        quality: str = params.strip().removeprefix("q=").strip() or "1"
+        try:
+            qualities[name.strip().lower()] = float(quality)
+        except ValueError:
+            qualities[name.strip().lower()] = 0.0
+    # An explicit gzip entry takes precedence over the * wildcard
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class CompressionMiddleware:
+    """Gzip response bodies for clients that accept it.
+
+    Bodies smaller than `minimum_size` are sent as they are, and so are
+    responses that set their own Content-Encoding or carry an already
+    compressed media type. Streaming bodies are compressed chunk by chunk and
+    flushed after each one, so the client sees every chunk as it is produced.
+    Chunks of at least `offload_size` bytes are compressed in a worker thread
+    to keep the event loop free.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        offload_size: int,
+        compresslevel: int = 6,
+    ) -> None:
+        self.app: ASGIApp = app
+        self.minimum_size: int = minimum_size
+        self.offload_size: int = offload_size
+        self.compresslevel: int = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(
+            Headers(scope=scope).get("accept-encoding")
+        ):
+            await CompressionResponder(self, send)(scope, receive)
+            return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, send: Send) -> None:
+        self.middleware: CompressionMiddleware = middleware
+        self.send: Send = send
+        self.start_message: Message = {}
+        self.compressor: Optional[Any] = None
+        self.passthrough: bool = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Headers can only be decided once the first body chunk is known
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.start_message:
+            start_message: Message = self.start_message
+            self.start_message = {}
+            self.passthrough = not self._should_compress(start_message, body, more_body)
+            if not self.passthrough:
+                self.compressor = zlib.compressobj(
+                    self.middleware.compresslevel, zlib.DEFLATED, zlib.MAX_WBITS | 16
+                )
+                body = await self._compress(body, more_body)
+                self._set_headers(start_message, body, more_body)
+                message = {**message, "body": body}
+            await self.send(start_message)
+            await self.send(message)
+            return
+        if not self.passthrough:
+            message = {**message, "body": await self._compress(body, more_body)}
+        await self.send(message)
+
+    def _should_compress(self, message: Message, body: bytes, more_body: bool) -> bool:
+        headers: Headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers:
+            return False
+        if headers.get("content-type", "").startswith(COMPRESSED_MEDIA_TYPES):
+            return False
+        return more_body or len(body) >= self.middleware.minimum_size
+
+    def _set_headers(self, message: Message, body: bytes, more_body: bool) -> None:
+        headers: MutableHeaders = MutableHeaders(raw=message["headers"])
+        headers["Content-Encoding"] = "gzip"
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+        # The compressed bytes differ from the identity representation
+        etag: Optional[str] = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= self.middleware.offload_size:
+            return await run_in_threadpool(self._compress_chunk, body, more_body)
+        return self._compress_chunk(body, more_body)
+
+    def _compress_chunk(self, body: bytes, more_body: bool) -> bytes:
+        flush_mode: int = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        return self.compressor.compress(body) + self.compressor.flush(flush_mode)
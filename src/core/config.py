@@ -9,11 +9,35 @@ load_dotenv()
 class Settings(BaseSettings):
     MONGO_URL: str = os.environ.get("MONGO_URL", "")
     DB_NAME: str = os.environ.get("DB_NAME", "")
+    STRICT_QUERY_PLANS: bool = os.environ.get("STRICT_QUERY_PLANS", False)  # type: ignore
 
     JWT_SECRET: str = os.environ.get("SECRET", "")
     JWT_ALGORITHM: str = os.environ.get("JWT_ALGORITHM", "")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", 15)  # type: ignore
+    STATELESS_TOKENS: bool = os.environ.get("STATELESS_TOKENS", False)  # type: ignore
+    REVOCATION_REFRESH_SECONDS: int = os.environ.get("REVOCATION_REFRESH_SECONDS", 30)  # type: ignore
+    TOKEN_CACHE_SIZE: int = os.environ.get("TOKEN_CACHE_SIZE", 10000)  # type: ignore
+    TOKEN_CACHE_TTL: int = os.environ.get("TOKEN_CACHE_TTL", 60)  # type: ignore
+    PASSWORD_HASH_WORKERS: int = os.environ.get("PASSWORD_HASH_WORKERS", 2)  # type: ignore
+    PASSWORD_HASH_QUEUE_LIMIT: int = os.environ.get("PASSWORD_HASH_QUEUE_LIMIT", 32)  # type: ignore
     APP_PORT: int = os.environ.get("APP_PORT")  # type: ignore
 
+    CATEGORY_CACHE_TTL: int = os.environ.get("CATEGORY_CACHE_TTL", 300)  # type: ignore
+    RESPONSE_CACHE_SIZE: int = os.environ.get("RESPONSE_CACHE_SIZE", 10000)  # type: ignore
+    RESPONSE_CACHE_TTL: int = os.environ.get("RESPONSE_CACHE_TTL", 10)  # type: ignore
+    SERIAL_INDEX_RELOAD_SECONDS: int = os.environ.get("SERIAL_INDEX_RELOAD_SECONDS", 60)  # type: ignore
+
+    DEFAULT_PAGE_SIZE: int = os.environ.get("DEFAULT_PAGE_SIZE", 100)  # type: ignore
+    MAX_PAGE_SIZE: int = os.environ.get("MAX_PAGE_SIZE", 1000)  # type: ignore
+    STREAM_BATCH_SIZE: int = os.environ.get("STREAM_BATCH_SIZE", 500)  # type: ignore
+    COMPRESSION_MINIMUM_SIZE: int = os.environ.get("COMPRESSION_MINIMUM_SIZE", 1024)  # type: ignore
+    COMPRESSION_OFFLOAD_SIZE: int = os.environ.get("COMPRESSION_OFFLOAD_SIZE", 262144)  # type: ignore
+    COMPRESSION_LEVEL: int = os.environ.get("COMPRESSION_LEVEL", 6)  # type: ignore
+    BULK_MAX_ITEMS: int = os.environ.get("BULK_MAX_ITEMS", 10000)  # type: ignore
+    IMPORT_BATCH_SIZE: int = os.environ.get("IMPORT_BATCH_SIZE", 1000)  # type: ignore
+    IMPORT_MAX_IN_FLIGHT: int = os.environ.get("IMPORT_MAX_IN_FLIGHT", 4)  # type: ignore
+    BULK_WRITE_BATCH_SIZE: int = os.environ.get("BULK_WRITE_BATCH_SIZE", 1000)  # type: ignore
+    BULK_ADJUST_MAX_IN_FLIGHT: int = os.environ.get("BULK_ADJUST_MAX_IN_FLIGHT", 16)  # type: ignore
+
 
 settings = Settings()
@@ -1,13 +1,34 @@
-from beanie import init_beanie
+from typing import Any, Dict, List, Tuple, Type
+
+from beanie import Document, init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
 import core.models as models
+from core.models.part import Location
 
 from .config import settings
 
 MONGO_URL: str = settings.MONGO_URL
 DB_NAME: str = settings.DB_NAME
 
+# Queries issued on every request or by the validation hooks, with their sort.
+# Each of them must be answered by an index.
+HOT_QUERIES: List[Tuple[Type[Document], Dict[str, Any], List[Tuple[str, int]]]] = [
+    (models.Part, {"category": ""}, []),
+    (models.Part, {"category": {"$in": [""]}}, [("_id", 1)]),
+    (models.Part, {"serial_number": ""}, []),
+    (models.Part, {"name": {"$regex": "^a"}}, [("_id", 1)]),
+    (models.Part, {"price": {"$gte": 0}}, [("_id", 1)]),
+    *[
+        (models.Part, {f"location.{field}": ""}, [("_id", 1)])
+        for field in Location.model_fields
+    ],
+    (models.Category, {"name": ""}, []),
+    (models.Category, {"parent_name": ""}, []),
+    (models.User, {"username": ""}, []),
+    (models.User, {"disabled": True}, []),
+]
+
 
 class Database:
     client: AsyncIOMotorClient = AsyncIOMotorClient(f"{MONGO_URL}/{DB_NAME}")
@@ -16,6 +37,33 @@ class Database:
         await init_beanie(
             database=self.client.get_default_database(), document_models=models.__all__
         )
+        await self.check_query_plans()
+
+    async def check_query_plans(self) -> None:
+        collection_scans: List[str] = []
+        for document, query, sort in HOT_QUERIES:
+            cursor = document.get_motor_collection().find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explain: Dict[str, Any] = await cursor.explain()
+            if uses_collection_scan(explain["queryPlanner"]["winningPlan"]):
+                collection_scans.append(f"{document.get_settings().name} {query}")
+        if not collection_scans:
+            return
+        message: str = f"Queries not covered by an index: {'; '.join(collection_scans)}"
+        if settings.STRICT_QUERY_PLANS:
+            raise RuntimeError(message)
+        print(f"WARNING: {message}")
 
     def close_db(self) -> None:
         self.client.close()
+
+
+def uses_collection_scan(plan: Any) -> bool:
+    if isinstance(plan, dict):
+        return plan.get("stage") == "COLLSCAN" or any(
+            uses_collection_scan(value) for value in plan.values()
+        )
+    if isinstance(plan, list):
+        return any(uses_collection_scan(value) for value in plan)
+    return False
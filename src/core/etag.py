@@ -0,0 +1,99 @@
+import hashlib
+from typing import Any, Dict, Optional, Tuple, Type
+
+import bson
+from beanie import Document, PydanticObjectId
+from beanie.odm.utils.projection import get_projection
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from .cache.response_cache import CachedResponse, response_cache
+from .models.collection_version import CollectionVersion
+from .negotiation import JSON_MEDIA_TYPE, wants_msgpack
+from .projection import parse_fields
+from .responses import ModelResponse
+
+
+def make_etag(content: bytes) -> str:
+    digest: str = hashlib.blake2b(content, digest_size=16).hexdigest()
+    # Each representation of the same content needs its own tag
+    return f'"{digest}-msgpack"' if wants_msgpack() else f'"{digest}"'
+
+
+def document_etag(document: Dict[str, Any]) -> str:
+    return make_etag(bson.encode(document))
+
+
+async def list_etag(request: Request, *collections: str) -> str:
+    """Tag a list response by its URL and the versions of the collections it reads.
+
+    Every write bumps the version of the collections it touches, so the tag
+    changes whenever the list could have changed, without running the query.
+    """
+    versions: Dict[str, int] = await CollectionVersion.get_versions(*collections)
+    return make_etag(f"{request.url.path}?{request.url.query}|{versions}".encode())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+async def find_tagged(
+    document: Type[Document], document_id: PydanticObjectId, projection: Type[BaseModel]
+) -> Optional[Tuple[Dict[str, Any], str]]:
+    found: Optional[Dict[str, Any]] = await document.get_motor_collection().find_one(
+        {"_id": document_id}, get_projection(projection)
+    )
+    return None if found is None else (found, document_etag(found))
+
+
+async def document_response(
+    document: Type[Document],
+    document_id: PydanticObjectId,
+    fields: Optional[str],
+    if_none_match: Optional[str],
+    message: str,
+) -> Optional[Response]:
+    """Respond with one document, or None if it does not exist.
+
+    Full documents are served from the response cache as serialized bytes once
+    read, so repeated reads cost neither a query nor a `model_dump`. Responses
+    with sparse `fields` always go to the database.
+    """
+    namespace: str = document.get_collection_name()
+    # Only the JSON representation of full documents is cached
+    cacheable: bool = fields is None and not wants_msgpack()
+    cached: Optional[CachedResponse] = (
+        await response_cache.get(namespace, str(document_id)) if cacheable else None
+    )
+    media_type: str = JSON_MEDIA_TYPE
+    if cached is None:
+        projection: Type[BaseModel] = parse_fields(document, fields) or document
+        found: Optional[Tuple[Dict[str, Any], str]] = await find_tagged(
+            document, document_id, projection
+        )
+        if found is None:
+            return None
+        content, etag = found
+        response: Response = ModelResponse(
+            {"message": message, "data": projection.model_validate(content)}
+        )
+        body: bytes = response.body
+        media_type = response.media_type
+        if cacheable:
+            await response_cache.set(namespace, str(document_id), (body, etag))
+    else:
+        body, etag = cached
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(body, media_type=media_type, headers={"ETag": etag})
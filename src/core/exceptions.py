@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Iterable
 
 from beanie import PydanticObjectId
 from fastapi import status
@@ -15,3 +15,23 @@ class CategoryNotFoundException(HTTPException):
     def __init__(self, category_id: PydanticObjectId):
         detail: Dict[str, str] = {"message": f"Category {str(category_id)} not found"}
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self, cursor: str):
+        detail: Dict[str, str] = {"message": f"Invalid cursor {cursor}"}
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class InvalidFieldsException(HTTPException):
+    def __init__(self, fields: Iterable[str]):
+        detail: Dict[str, str] = {"message": f"Unknown fields {', '.join(fields)}"}
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class InsufficientStockException(HTTPException):
+    def __init__(self, part_id: PydanticObjectId | str):
+        detail: Dict[str, str] = {
+            "message": f"Insufficient stock of part {str(part_id)}"
+        }
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
@@ -0,0 +1,172 @@
+import asyncio
+import csv
+import io
+import json
+import shutil
+import tempfile
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from starlette.concurrency import run_in_threadpool
+
+from .bulk import insert_parts
+from .models.part import Location
+
+
+class RowError(str):
+    pass
+
+
+Row = Union[Dict[str, Any], RowError]
+# Rows are numbered by their line in the file, so errors point at the source
+NumberedRow = Tuple[int, Row]
+RowReader = Callable[[IO[str]], Iterator[NumberedRow]]
+
+
+def read_csv_rows(lines: IO[str]) -> Iterator[NumberedRow]:
+    reader: csv.DictReader = csv.DictReader(lines)
+    for record in reader:
+        row: Dict[str, Any] = {}
+        location: Dict[str, Any] = {}
+        for column, value in record.items():
+            if column is None or value is None or value == "":
+                continue
+            name: str = column.strip().removeprefix("location.")
+            if name in Location.model_fields:
+                location[name] = value
+            else:
+                row[name] = value
+        row["location"] = location
+        yield reader.line_num, row
+
+
+def read_jsonl_rows(lines: IO[str]) -> Iterator[NumberedRow]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row: Any = json.loads(line)
+        except ValueError as e:
+            yield line_number, RowError(f"Invalid JSON: {e}")
+            continue
+        yield line_number, (
+            row if isinstance(row, dict) else RowError("Row must be a JSON object")
+        )
+
+
+def get_row_reader(filename: str | None, content_type: str | None) -> RowReader | None:
+    name: str = (filename or "").lower()
+    media_type: str = (content_type or "").split(";")[0].strip()
+    if name.endswith(".csv") or media_type == "text/csv":
+        return read_csv_rows
+    if name.endswith((".jsonl", ".ndjson")) or media_type in (
+        "application/jsonl",
+        "application/x-ndjson",
+    ):
+        return read_jsonl_rows
+    return None
+
+
+def spool_upload(upload: IO[bytes]) -> IO[str]:
+    # The upload is closed once the endpoint returns, so copy it to a private
+    # temporary file that the streaming response can read at its own pace
+    spool: IO[bytes] = tempfile.TemporaryFile()
+    shutil.copyfileobj(upload, spool)
+    spool.seek(0)
+    return io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+
+
+async def import_parts(
+    rows: Iterator[NumberedRow], batch_size: int, max_in_flight: int
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """Insert `rows` in batches, yielding error, progress and summary events.
+
+    Rows are read `batch_size` at a time off the event loop and at most
+    `max_in_flight` batches are being written at once, so memory depends on
+    those two settings and never on the size of the input. If reading or a
+    batch fails, the batches still in flight are cancelled and the summary is
+    marked as aborted; rows of unfinished batches may be partially written.
+    """
+    totals: Dict[str, int] = {"processed": 0, "created": 0, "failed": 0}
+    pending: Set[asyncio.Task] = set()
+    aborted: bool = False
+    try:
+        while True:
+            batch: List[NumberedRow] = await run_in_threadpool(
+                lambda: list(islice(rows, batch_size))
+            )
+            if batch:
+                pending.add(asyncio.create_task(_import_batch(batch)))
+            if len(pending) < max_in_flight and batch:
+                continue
+            if not pending:
+                break
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for event in _batch_events(done, totals):
+                yield event
+    except Exception as e:
+        aborted = True
+        yield {"type": "error", "row": None, "detail": f"Import aborted: {e}"}
+    finally:
+        # Never leave batches writing in the background once the import stops,
+        # including when the client disconnects mid-stream
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    yield {"type": "summary", **totals, "aborted": aborted}
+
+
+def _batch_events(
+    done: Set[asyncio.Task], totals: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    failure: Optional[BaseException] = None
+    for task in done:
+        if task.exception() is not None:
+            failure = task.exception()
+            continue
+        processed, errors = task.result()
+        yield from errors
+        totals["processed"] += processed
+        totals["failed"] += len(errors)
+        totals["created"] += processed - len(errors)
+        yield {"type": "progress", **totals}
+    # Results of the batches that did finish are reported before the failure
+    if failure is not None:
+        raise failure
+
+
+async def _import_batch(batch: List[NumberedRow]) -> Tuple[int, List[Dict[str, Any]]]:
+    errors: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    row_numbers: List[int] = []
+    for row_number, row in batch:
+        if isinstance(row, RowError):
+            errors.append({"type": "error", "row": row_number, "detail": str(row)})
+        else:
+            rows.append(row)
+            row_numbers.append(row_number)
+    for result in await insert_parts(rows):
+        if result["status"] == "error":
+            errors.append(
+                {
+                    "type": "error",
+                    "row": row_numbers[result["index"]],
+                    "detail": result["detail"],
+                }
+            )
+    errors.sort(key=lambda error: error["row"])
+    return len(batch), errors
@@ -1,5 +1,7 @@
+from .auth.revoked_user import RevokedUser
 from .auth.user import User
 from .category import Category
+from .collection_version import CollectionVersion
 from .part import Part
 
-__all__ = [Category, Part, User]  # type: ignore
+__all__ = [Category, CollectionVersion, Part, RevokedUser, User]  # type: ignore
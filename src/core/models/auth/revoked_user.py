@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import List
+
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from ...config import settings
+
+
+class RevokedUser(Document):
+    id: PydanticObjectId
+    revoked_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    async def revoke(cls, user_id: PydanticObjectId) -> None:
+        await cls.get_motor_collection().update_one(
+            {"_id": user_id},
+            {"$set": {"revoked_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    class Settings:
+        name: str = "revoked_users"
+        # A deleted user's tokens cannot outlive the token lifetime
+        indexes: List[IndexModel] = [
+            IndexModel(
+                [("revoked_at", ASCENDING)],
+                expireAfterSeconds=int(settings.ACCESS_TOKEN_EXPIRE_MINUTES) * 60,
+            )
+        ]
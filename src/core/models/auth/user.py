@@ -1,13 +1,55 @@
-from typing import Annotated
+from typing import Annotated, List
 
-from beanie import Document, Indexed
-from pydantic import EmailStr
+from beanie import (
+    Delete,
+    Document,
+    Indexed,
+    PydanticObjectId,
+    Replace,
+    Save,
+    SaveChanges,
+    Update,
+    after_event,
+)
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pymongo import ASCENDING, IndexModel
+
+from ...cache.revocation import revocation_list
+from ...cache.token_cache import invalidate_user
+from .revoked_user import RevokedUser
 
 
 class User(Document):
     username: Annotated[str, Indexed(unique=True)]
     email: Annotated[EmailStr, Indexed(unique=True)]
     password: str
+    disabled: bool = False
+
+    @after_event(Update, Replace, Save, SaveChanges, Delete)
+    def invalidate_cached_tokens(self):
+        invalidate_user(self.id)
+
+    @after_event(Update, Replace, Save, SaveChanges)
+    def update_revocation_list(self):
+        revocation_list.set_disabled(self.id, self.disabled)
+
+    @after_event(Delete)
+    async def revoke_deleted_user(self):
+        await RevokedUser.revoke(self.id)
+        revocation_list.add_deleted(self.id)
 
     class Settings:
         name: str = "users"
+        indexes: List[IndexModel] = [
+            IndexModel(
+                [("disabled", ASCENDING)], partialFilterExpression={"disabled": True}
+            )
+        ]
+
+
+class UserView(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    username: str
+    email: EmailStr
@@ -1,50 +1,135 @@
-from typing import Annotated, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from beanie import Delete, Document, Indexed, Insert, Update, before_event
+from beanie import (
+    Delete,
+    Document,
+    Indexed,
+    Insert,
+    PydanticObjectId,
+    Replace,
+    Save,
+    SaveChanges,
+    Update,
+    after_event,
+    before_event,
+)
 from fastapi import HTTPException, status
 from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from ..cache.category_tree import CategoryNode, category_tree
+from ..cache.response_cache import response_cache
+
+CHILDREN_ERROR: str = "Could not modify category with children"
+PARTS_ERROR: str = "Could not modify category assigned to parts"
+
+
+async def validate_parent_category(name: Optional[str], parent_name: str) -> None:
+    parent_category: Optional[CategoryNode] = await category_tree.get(parent_name)
+    if not parent_category or name == parent_category.name:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f'Could not assign category to "{parent_name}"',
+        )
+
+
+def category_modification_error(category: Dict[str, Any]) -> Optional[str]:
+    if category.get("child_count"):
+        return CHILDREN_ERROR
+    if category.get("part_count"):
+        return PARTS_ERROR
+    return None
 
 
 class Category(Document):
     name: Annotated[str, Indexed(unique=True)]
     parent_name: str | None = None
+    child_count: int = 0
+    part_count: int = 0
 
     @before_event(Insert, Update)
     async def parent_category_exists(self):
         if self.parent_name is not None:
-            parent_category: Category = await Category.find_one(
-                {"name": self.parent_name}
-            )
-            if not parent_category or self == parent_category:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f'Could not assign category to "{self.parent_name}"',
-                )
+            await validate_parent_category(self.name, self.parent_name)
 
     @before_event(Delete, Update)
     async def children_categories_exists(self):
-        children_categories: Category = await Category.find_one(
-            {"parent_name": self.name}
-        )
-        if children_categories:
+        if self.child_count > 0:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Could not modify category with children",
+                status_code=status.HTTP_409_CONFLICT, detail=CHILDREN_ERROR
             )
 
     @before_event(Delete, Update)
     async def part_with_category_exists(self):
+        if self.part_count > 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=PARTS_ERROR
+            )
+
+    @after_event(Insert, Update, Replace, Save, SaveChanges, Delete)
+    def invalidate_category_tree(self):
+        category_tree.invalidate()
+
+    @classmethod
+    async def find_subtree(
+        cls, category_id: PydanticObjectId
+    ) -> Optional[Dict[str, Any]]:
+        subtrees: List[Dict[str, Any]] = await cls.aggregate(
+            [
+                {"$match": {"_id": category_id}},
+                {
+                    "$graphLookup": {
+                        "from": cls.get_settings().name,
+                        "startWith": "$name",
+                        "connectFromField": "name",
+                        "connectToField": "parent_name",
+                        "as": "descendants",
+                    }
+                },
+            ]
+        ).to_list()
+        return subtrees[0] if subtrees else None
+
+    @classmethod
+    async def rebuild_counters(cls, query: Optional[Dict[str, Any]] = None) -> None:
+        from ..bookkeeping import record_write
         from .part import Part
 
-        part: Part = await Part.find_one({"category": self.name})
-        if part:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Could not modify category assigned to parts",
+        names: List[str] = [
+            document["name"]
+            async for document in cls.get_motor_collection().find(
+                query or {}, {"_id": 0, "name": 1}
             )
+        ]
+        if not names:
+            return
+        counts: Dict[str, Dict[str, int]] = {
+            name: {"child_count": 0, "part_count": 0} for name in names
+        }
+        for document, field, counter in (
+            (Part, "category", "part_count"),
+            (cls, "parent_name", "child_count"),
+        ):
+            async for group in document.get_motor_collection().aggregate(
+                [
+                    {"$match": {field: {"$in": names}}},
+                    {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                ]
+            ):
+                counts[group["_id"]][counter] = group["count"]
+        await cls.get_motor_collection().bulk_write(
+            [
+                UpdateOne({"name": name}, {"$set": count})
+                for name, count in counts.items()
+            ],
+            ordered=False,
+        )
+        await record_write([cls.get_collection_name()])
+        await response_cache.clear(cls.get_collection_name())
 
     class Settings:
         name: str = "categories"
+        indexes: List[IndexModel] = [IndexModel([("parent_name", ASCENDING)])]
 
 
 class UpdateCategory(BaseModel):
@@ -0,0 +1,31 @@
+from typing import Dict
+
+from beanie import Document
+from pymongo import UpdateOne
+
+
+class CollectionVersion(Document):
+    id: str
+    version: int = 0
+
+    @classmethod
+    async def bump(cls, *names: str) -> None:
+        await cls.get_motor_collection().bulk_write(
+            [
+                UpdateOne({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+                for name in names
+            ],
+            ordered=False,
+        )
+
+    @classmethod
+    async def get_versions(cls, *names: str) -> Dict[str, int]:
+        versions: Dict[str, int] = {name: 0 for name in names}
+        async for document in cls.get_motor_collection().find(
+            {"_id": {"$in": list(names)}}
+        ):
+            versions[document["_id"]] = document["version"]
+        return versions
+
+    class Settings:
+        name: str = "collection_versions"
@@ -1,8 +1,12 @@
-from typing import Annotated, Optional
+import re
+from typing import Annotated, Any, Dict, FrozenSet, List, Optional
 
 from beanie import Document, Indexed, Insert, Update, after_event, before_event
 from fastapi import HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, TEXT, IndexModel
+
+from ..cache.category_tree import CategoryNode, category_tree
 
 
 class Location(BaseModel):
@@ -14,6 +18,20 @@ class Location(BaseModel):
     row: Optional[str | int] = None
 
 
+def part_category_error(name: str, category: Optional[CategoryNode]) -> Optional[str]:
+    if not category:
+        return f'Could not assign part to category "{name}" do not exist'
+    if category.is_base:
+        return f'Could not assign part to base category "{name}"'
+    return None
+
+
+async def validate_part_category(name: str) -> None:
+    detail: Optional[str] = part_category_error(name, await category_tree.get(name))
+    if detail is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
 class Part(Document):
     serial_number: Annotated[str, Indexed(unique=True)]
     name: str
@@ -25,38 +43,45 @@ class Part(Document):
 
     @before_event(Insert)
     async def validate_category_exists(self):
-        from .category import Category
-
-        category: Category = await Category.find_one({"name": self.category})
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f'Could not assign part to category "{self.category}" do not exist',
-            )
-        if not category.parent_name:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f'Could not assign part to base category "{self.category}"',
-            )
+        await self._validate_category()
 
     @after_event(Update)
     async def validate_category_is_not_base(self):
-        from .category import Category
-
-        category: Category = await Category.find_one({"name": self.category})
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f'Could not assign part to category "{self.category}" do not exist',
-            )
-        if not category.parent_name:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f'Could not assign part to base category "{self.category}"',
-            )
+        await self._validate_category()
+
+    async def _validate_category(self):
+        await validate_part_category(self.category)
 
     class Settings:
         name: str = "parts"
+        indexes: List[IndexModel] = [
+            IndexModel([("category", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("category", ASCENDING), ("price", ASCENDING)]),
+            IndexModel([("category", ASCENDING), ("quantity", ASCENDING)]),
+            IndexModel([("price", ASCENDING)]),
+            IndexModel([("quantity", ASCENDING)]),
+            IndexModel([("name", ASCENDING)]),
+            IndexModel(
+                [
+                    ("location.room", ASCENDING),
+                    ("location.bookcase", ASCENDING),
+                    ("location.shelf", ASCENDING),
+                    ("location.cubicle", ASCENDING),
+                    ("location.column", ASCENDING),
+                    ("location.row", ASCENDING),
+                ]
+            ),
+            # Every location field is filterable on its own, not only with room
+            *[
+                IndexModel([(f"location.{field}", ASCENDING)])
+                for field in ("bookcase", "shelf", "cubicle", "column", "row")
+            ],
+            IndexModel(
+                [("name", TEXT), ("description", TEXT)],
+                weights={"name": 10, "description": 1},
+                name="part_text",
+            ),
+        ]
 
 
 class UpdatePart(BaseModel):
@@ -67,3 +92,110 @@ class UpdatePart(BaseModel):
     quantity: Optional[int] = None
     price: Optional[float] = None
     location: Optional[Location] = None
+
+    def to_update(self) -> Dict[str, Any]:
+        return _set_fields(self)
+
+
+def _set_fields(
+    update: BaseModel, exclude: FrozenSet[str] = frozenset()
+) -> Dict[str, Any]:
+    # Location is set field by field so a partial location keeps the rest
+    fields: Dict[str, Any] = update.model_dump(
+        exclude_none=True, exclude={"location", *exclude}
+    )
+    location: Optional[Location] = getattr(update, "location", None)
+    if location is not None:
+        for field, value in location.model_dump(exclude_none=True).items():
+            fields[f"location.{field}"] = value
+    return {"$set": fields} if fields else {}
+
+
+class PartFilter(BaseModel):
+    category: Optional[str] = None
+    name: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_quantity: Optional[int] = None
+    max_quantity: Optional[int] = None
+    room: Optional[str] = None
+    bookcase: Optional[str] = None
+    shelf: Optional[str] = None
+    cubicle: Optional[str] = None
+    column: Optional[str] = None
+    row: Optional[str] = None
+
+    def to_query(self) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if self.category is not None:
+            query["category"] = self.category
+        if self.name is not None:
+            query["name"] = {"$regex": f"^{re.escape(self.name)}"}
+        for field, lower, upper in (
+            ("price", self.min_price, self.max_price),
+            ("quantity", self.min_quantity, self.max_quantity),
+        ):
+            bounds: Dict[str, Any] = {}
+            if lower is not None:
+                bounds["$gte"] = lower
+            if upper is not None:
+                bounds["$lte"] = upper
+            if bounds:
+                query[field] = bounds
+        for field in Location.model_fields:
+            value: Optional[str] = getattr(self, field)
+            if value is not None:
+                query[f"location.{field}"] = self._location_value(value)
+        return query
+
+    @staticmethod
+    def _location_value(value: str) -> Any:
+        # Location fields accept both str and int, so "3" must also match 3
+        if re.fullmatch(r"-?[0-9]+", value):
+            return {"$in": [value, int(value)]}
+        return value
+
+
+class BulkPartFilter(PartFilter):
+    serial_numbers: Optional[List[str]] = None
+
+    def to_query(self) -> Dict[str, Any]:
+        query: Dict[str, Any] = super().to_query()
+        if self.serial_numbers is not None:
+            query["serial_number"] = {"$in": self.serial_numbers}
+        return query
+
+
+class BulkPartUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    quantity: Optional[int] = None
+    price: Optional[float] = None
+    price_change_percent: Optional[float] = Field(default=None, gt=-100)
+    location: Optional[Location] = None
+
+    def to_update(self) -> Dict[str, Any]:
+        update: Dict[str, Any] = _set_fields(
+            self, exclude=frozenset({"price_change_percent"})
+        )
+        if self.price_change_percent is not None:
+            update["$mul"] = {"price": 1 + self.price_change_percent / 100}
+        return update
+
+
+class BulkUpdateParts(BaseModel):
+    filter: BulkPartFilter
+    update: BulkPartUpdate
+
+
+class BulkDeleteParts(BaseModel):
+    filter: BulkPartFilter
+
+
+class StockAdjustment(BaseModel):
+    delta: int
+
+
+class SerialStockAdjustment(StockAdjustment):
+    serial_number: str
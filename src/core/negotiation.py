@@ -0,0 +1,110 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+JSON_MEDIA_TYPE: str = "application/json"
+MSGPACK_MEDIA_TYPE: str = "application/msgpack"
+MSGPACK_MEDIA_TYPES: tuple = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+# Media ranges a client may send, mapped to the format they select
+NEGOTIABLE_MEDIA_TYPES: Dict[str, str] = {
+    JSON_MEDIA_TYPE: JSON_MEDIA_TYPE,
+    "application/*": JSON_MEDIA_TYPE,
+    "*/*": JSON_MEDIA_TYPE,
+    **{media_type: MSGPACK_MEDIA_TYPE for media_type in MSGPACK_MEDIA_TYPES},
+}
+
+response_media_type: ContextVar[str] = ContextVar(
+    "response_media_type", default=JSON_MEDIA_TYPE
+)
+
+
+def is_msgpack(media_type: Optional[str]) -> bool:
+    return (media_type or "").split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES
+
+
+def accepted_media_types(accept: Optional[str]) -> List[Tuple[str, float]]:
+    accepted: List[Tuple[str, float]] = []
+    for media_range in (accept or "").split(","):
+        name, *params = media_range.split(";")
+        quality: float = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            accepted.append((name.strip().lower(), quality))
+    return accepted
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Pick the acceptable format the client gives the highest quality.
+
+    At equal quality an exact media type beats a wildcard and then the first
+    one listed wins. Anything else, including no Accept header, gets JSON as it
+    always did.
+    """
+    candidates: List[Tuple[float, bool, int, str]] = [
+        (quality, "*" not in name, -position, NEGOTIABLE_MEDIA_TYPES[name])
+        for position, (name, quality) in enumerate(accepted_media_types(accept))
+        if name in NEGOTIABLE_MEDIA_TYPES and quality > 0
+    ]
+    return max(candidates)[-1] if candidates else JSON_MEDIA_TYPE
+
+
+def wants_msgpack() -> bool:
+    return response_media_type.get() == MSGPACK_MEDIA_TYPE
+
+
+class MsgPackRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Route that speaks MessagePack as well as JSON.
+
+    The response format is negotiated from Accept and stored in a context
+    variable that `ModelResponse` reads, so handlers stay format agnostic.
+    MessagePack request bodies are decoded where FastAPI expects JSON, so the
+    same pydantic models validate both formats.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler: Callable[
+            [Request], Coroutine[Any, Any, Response]
+        ] = super().get_route_handler()
+
+        async def negotiated_route_handler(request: Request) -> Response:
+            media_type: str = negotiate_media_type(request.headers.get("accept"))
+            if is_msgpack(request.headers.get("content-type")):
+                request = MsgPackRequest(_as_json_scope(request), request.receive)
+            token: Any = response_media_type.set(media_type)
+            try:
+                response: Response = await route_handler(request)
+            finally:
+                response_media_type.reset(token)
+            response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiated_route_handler
+
+
+def _as_json_scope(request: Request) -> Dict[str, Any]:
+    # FastAPI only parses bodies it sees as JSON, through `Request.json`
+    return {
+        **request.scope,
+        "headers": [
+            (name, JSON_MEDIA_TYPE.encode())
+            if name == b"content-type"
+            else (name, value)
+            for name, value in request.scope["headers"]
+        ],
+    }
@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from typing import Annotated, Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from beanie import Document, PydanticObjectId
+from bson.errors import InvalidId
+from fastapi import Query
+from pydantic import BaseModel
+
+from .config import settings
+from .exceptions import InvalidCursorException
+
+DocType = TypeVar("DocType", bound=Document)
+
+PageLimit = Annotated[int, Query(ge=1, le=settings.MAX_PAGE_SIZE)]
+
+
+def encode_cursor(*values: Any) -> str:
+    raw: bytes = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    padded: str = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values: Any = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        raise InvalidCursorException(cursor)
+    if not isinstance(values, list) or not values:
+        raise InvalidCursorException(cursor)
+    return values
+
+
+def decode_id_cursor(cursor: str) -> PydanticObjectId:
+    try:
+        return PydanticObjectId(decode_cursor(cursor)[0])
+    except (InvalidId, TypeError):
+        raise InvalidCursorException(cursor)
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, PydanticObjectId]:
+    values: List[Any] = decode_cursor(cursor)
+    try:
+        return float(values[0]), PydanticObjectId(values[1])
+    except (IndexError, InvalidId, TypeError, ValueError):
+        raise InvalidCursorException(cursor)
+
+
+def after_cursor(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    if cursor is None:
+        return query
+    return {"$and": [query, {"_id": {"$gt": decode_id_cursor(cursor)}}]}
+
+
+async def paginate(
+    document: Type[DocType],
+    query: Dict[str, Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Type[BaseModel]] = None,
+) -> Tuple[List[BaseModel], Optional[str]]:
+    """Return one page of `document` ordered by `_id` and the cursor of the next one.
+
+    Pages are selected with an `_id` range instead of `skip`, so every page is
+    an index seek regardless of how deep the client has scrolled.
+    """
+    query = after_cursor(query, cursor)
+    items: List[BaseModel] = (
+        await document.find(query, projection_model=projection or document)
+        .sort("_id")
+        .limit(limit + 1)
+        .to_list()
+    )
+    if len(items) <= limit:
+        return items, None
+    return items[:limit], encode_cursor(items[limit - 1].id)  # type: ignore
@@ -0,0 +1,43 @@
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Type
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+from .exceptions import InvalidFieldsException
+
+
+@lru_cache(maxsize=128)
+def projection_model(
+    document: Type[Document], fields: FrozenSet[str]
+) -> Type[BaseModel]:
+    """Build a model holding only `fields` of `document`.
+
+    Beanie derives the Mongo projection from the model fields, so only the
+    requested fields leave the database and only they are validated.
+    """
+    definitions: Dict[str, Any] = {
+        name: (document.model_fields[name].annotation, None) for name in sorted(fields)
+    }
+    return create_model(  # type: ignore
+        f"{document.__name__}Fields",
+        __config__=ConfigDict(populate_by_name=True),
+        id=(Optional[PydanticObjectId], Field(default=None, alias="_id")),
+        **definitions,
+    )
+
+
+def parse_fields(
+    document: Type[Document], fields: Optional[str]
+) -> Optional[Type[BaseModel]]:
+    if not fields:
+        return None
+    requested: FrozenSet[str] = frozenset(
+        name.strip() for name in fields.split(",") if name.strip()
+    ) - {"id"}
+    unknown: FrozenSet[str] = requested - (
+        document.model_fields.keys() - {"revision_id"}
+    )
+    if unknown:
+        raise InvalidFieldsException(sorted(unknown))
+    return projection_model(document, requested)
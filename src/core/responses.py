@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Any, List, Type
+
+import msgpack
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticSerializationError
+
+from .negotiation import MSGPACK_MEDIA_TYPE, wants_msgpack
+
+content_adapter: TypeAdapter = TypeAdapter(Any)
+
+
+@lru_cache(maxsize=128)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])  # type: ignore
+
+
+def value_adapter(value: Any) -> TypeAdapter:
+    # A typed adapter skips inferring the serializer of every item in a page
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        model: Type[BaseModel] = type(value[0])
+        if all(type(item) is model for item in value):
+            return list_adapter(model)
+    return content_adapter
+
+
+def dump_json(value: Any) -> bytes:
+    return value_adapter(value).dump_json(value)
+
+
+def dump_python(value: Any) -> Any:
+    return value_adapter(value).dump_python(value, mode="json")
+
+
+class ModelResponse(JSONResponse):
+    """JSON response that serializes pydantic models in `content` straight to bytes.
+
+    Models are left as they are instead of being dumped to dicts first, so
+    pydantic-core writes the JSON in a single pass without the stdlib encoder.
+    When the client negotiated MessagePack, the same content is packed instead.
+    """
+
+    def __init__(self, content: Any, *args: Any, **kwargs: Any) -> None:
+        if wants_msgpack():
+            self.media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        try:
+            if self.media_type == MSGPACK_MEDIA_TYPE:
+                return msgpack.packb(
+                    {key: dump_python(value) for key, value in content.items()}
+                    if isinstance(content, dict)
+                    else dump_python(content)
+                )
+            if isinstance(content, dict):
+                return (
+                    b"{"
+                    + b",".join(
+                        content_adapter.dump_json(str(key)) + b":" + dump_json(value)
+                        for key, value in content.items()
+                    )
+                    + b"}"
+                )
+            return dump_json(content)
+        except PydanticSerializationError:
+            # Values pydantic cannot infer a serializer for, e.g. a bare ObjectId
+            encoded: Any = jsonable_encoder(content, custom_encoder={ObjectId: str})
+            if self.media_type == MSGPACK_MEDIA_TYPE:
+                return msgpack.packb(encoded)
+            return super().render(encoded)
@@ -15,7 +15,7 @@ router: APIRouter = APIRouter()
 
 @router.post("/register", description="Register")
 async def register(user_data: User):
-    user_data.password = auth_handler.get_password_hash(user_data.password)
+    user_data.password = await auth_handler.get_password_hash_async(user_data.password)
     try:
         user: User = await user_data.create()  # noqa
     except DuplicateKeyError as e:
@@ -36,7 +36,15 @@ async def get_token(
     user_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     user: User = await User.find_one({"username": user_data.username})
-    if not user or not auth_handler.verify_password(user_data.password, user.password):
+    if (
+        not user
+        or user.disabled
+        or not await auth_handler.verify_password_async(
+            user_data.password, user.password
+        )
+    ):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token: str = auth_handler.encode_token(user.id)
+    token: str = auth_handler.encode_token(
+        user.id, claims={"username": user.username, "email": user.email}
+    )
     return Token(access_token=token, token_type="bearer")
@@ -1,32 +1,125 @@
-from typing import Any, Dict
+from typing import Annotated, Any, Dict, List, Optional
 
 from beanie import PydanticObjectId
-from beanie.exceptions import RevisionIdWasChanged
-from beanie.operators import Set
-from fastapi import APIRouter, Body, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Body, Header, HTTPException, Request, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
+from ..bookkeeping import record_write
+from ..cache.category_tree import category_tree
+from ..cache.response_cache import response_cache
+from ..config import settings
+from ..etag import document_response, etag_matches, list_etag, not_modified
 from ..exceptions import CategoryNotFoundException
-from ..models.category import Category, UpdateCategory
+from ..models.category import (
+    Category,
+    UpdateCategory,
+    category_modification_error,
+    validate_parent_category,
+)
+from ..models.part import Part
+from ..negotiation import NegotiatedRoute
+from ..pagination import PageLimit, paginate
+from ..projection import parse_fields
+from ..responses import ModelResponse
+
+router: APIRouter = APIRouter(route_class=NegotiatedRoute)
 
-router: APIRouter = APIRouter()
+# Only categories without children or parts can be modified or deleted
+MODIFIABLE_QUERY: Dict[str, Any] = {"child_count": 0, "part_count": 0}
 
 
 @router.get(
     "/{category_id}",
     response_description="Get single category",
 )
-async def get_category(category_id: PydanticObjectId):
-    category: Category = await Category.get(category_id)
-    if category is not None:
-        return JSONResponse(
-            {
-                "message": f"Category {str(category_id)} retrieved",
-                "data": category.model_dump(),
-            }
-        )
-    raise CategoryNotFoundException(category_id)
+async def get_category(
+    category_id: PydanticObjectId,
+    fields: Optional[str] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    response: Optional[Response] = await document_response(
+        Category,
+        category_id,
+        fields,
+        if_none_match,
+        f"Category {str(category_id)} retrieved",
+    )
+    if response is None:
+        raise CategoryNotFoundException(category_id)
+    return response
+
+
+@router.get(
+    "/{category_id}/tree",
+    response_description="Get category with all its descendants",
+)
+async def get_category_tree(
+    request: Request,
+    category_id: PydanticObjectId,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    etag: str = await list_etag(request, Category.get_collection_name())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    subtree: Optional[Dict[str, Any]] = await Category.find_subtree(category_id)
+    if subtree is None:
+        raise CategoryNotFoundException(category_id)
+    nodes: Dict[str, Dict[str, Any]] = {
+        document["name"]: {
+            **Category.model_validate(document).model_dump(),
+            "children": [],
+        }
+        for document in [subtree, *subtree["descendants"]]
+    }
+    for document in sorted(subtree["descendants"], key=lambda item: item["name"]):
+        nodes[document["parent_name"]]["children"].append(nodes[document["name"]])
+    return ModelResponse(
+        {
+            "message": f"Category {str(category_id)} tree retrieved",
+            "data": nodes[subtree["name"]],
+        },
+        headers={"ETag": etag},
+    )
+
+
+@router.get(
+    "/{category_id}/parts",
+    response_description="List parts in category and its descendants",
+)
+async def list_category_parts(
+    request: Request,
+    category_id: PydanticObjectId,
+    limit: PageLimit = settings.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    etag: str = await list_etag(
+        request, Category.get_collection_name(), Part.get_collection_name()
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    subtree: Optional[Dict[str, Any]] = await Category.find_subtree(category_id)
+    if subtree is None:
+        raise CategoryNotFoundException(category_id)
+    names: List[str] = [
+        document["name"] for document in [subtree, *subtree["descendants"]]
+    ]
+    parts: List[BaseModel]
+    parts, next_cursor = await paginate(
+        Part,
+        {"category": {"$in": names}},
+        limit,
+        cursor,
+        parse_fields(Part, fields),
+    )
+    return ModelResponse(
+        {"data": parts, "next_cursor": next_cursor},
+        headers={"ETag": etag},
+    )
 
 
 @router.post(
@@ -34,6 +127,7 @@ async def get_category(category_id: PydanticObjectId):
     response_description="Create category",
 )
 async def create_category(category: Category):
+    category.child_count = category.part_count = 0
     try:
         new_category: Category = await category.create()
     except DuplicateKeyError as e:
@@ -41,12 +135,15 @@ async def create_category(category: Category):
             status_code=status.HTTP_409_CONFLICT,
             detail=f'Category with {e.details.get("keyValue")} already exists',
         )
-    created_category: Category = await Category.get(new_category.id)
-    return JSONResponse(
+    await record_write(
+        [Category.get_collection_name()],
+        {"child_count": {new_category.parent_name: 1}},
+    )
+    return ModelResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": f"Category {new_category.id} created",
-            "data": created_category.model_dump(),
+            "data": new_category,
         },
     )
 
@@ -55,34 +152,77 @@ async def create_category(category: Category):
 async def update_category(
     category_id: PydanticObjectId, data: UpdateCategory = Body(...)
 ):
-    category: Category = await Category.find_one({"_id": category_id})
-    if not category:
-        raise CategoryNotFoundException(category_id)
     update_data: Dict[str, Any] = data.model_dump(exclude_none=True)
     if not update_data:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+    query: Dict[str, Any] = {"_id": category_id, **MODIFIABLE_QUERY}
+    if data.parent_name is not None:
+        await validate_parent_category(data.name, data.parent_name)
+        if data.name is None:
+            query["name"] = {"$ne": data.parent_name}
     try:
-        updated_category: Category = await category.update(Set(update_data))
-    except (DuplicateKeyError, RevisionIdWasChanged):
+        old_category: Optional[
+            Dict[str, Any]
+        ] = await Category.get_motor_collection().find_one_and_update(
+            query, {"$set": update_data}, return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Category with this serial number already exists",
         )
-
-    if updated_category is not None:
-        return JSONResponse(
-            {
-                "message": f"Category {str(category_id)} updated",
-                "data": updated_category.model_dump(),
-            }
+    if old_category is None:
+        raise await _modification_exception(
+            category_id, f'Could not assign category to "{data.parent_name}"'
         )
-    raise CategoryNotFoundException(category_id)
+    category_tree.invalidate()
+    updated_category: Category = Category.model_validate(
+        {**old_category, **update_data}
+    )
+    old_parent_name: Optional[str] = old_category.get("parent_name")
+    deltas: Dict[Optional[str], int] = (
+        {old_parent_name: -1, updated_category.parent_name: 1}
+        if updated_category.parent_name != old_parent_name
+        else {}
+    )
+    await record_write([Category.get_collection_name()], {"child_count": deltas})
+    await response_cache.delete(Category.get_collection_name(), [str(category_id)])
+    return ModelResponse(
+        {
+            "message": f"Category {str(category_id)} updated",
+            "data": updated_category,
+        }
+    )
 
 
 @router.delete("/{category_id}", response_description="Delete category")
 async def delete_category(category_id: PydanticObjectId):
-    category: Category = await Category.get(category_id)
-    if not category:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-    await category.delete()
-    return JSONResponse({"message": f"Category {str(category_id)} deleted"})
+    category: Optional[
+        Dict[str, Any]
+    ] = await Category.get_motor_collection().find_one_and_delete(
+        {"_id": category_id, **MODIFIABLE_QUERY}, projection={"parent_name": 1}
+    )
+    if category is None:
+        raise await _modification_exception(category_id, "Could not delete category")
+    category_tree.invalidate()
+    await record_write(
+        [Category.get_collection_name()],
+        {"child_count": {category.get("parent_name"): -1}},
+    )
+    await response_cache.delete(Category.get_collection_name(), [str(category_id)])
+    return ModelResponse({"message": f"Category {str(category_id)} deleted"})
+
+
+async def _modification_exception(
+    category_id: PydanticObjectId, detail: str
+) -> HTTPException:
+    # Only reached when the conditional write matched nothing, to tell why
+    category: Optional[Dict[str, Any]] = await Category.get_motor_collection().find_one(
+        {"_id": category_id}, {"child_count": 1, "part_count": 1}
+    )
+    if category is None:
+        return CategoryNotFoundException(category_id)
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=category_modification_error(category) or detail,
+    )
@@ -1,31 +1,92 @@
-from typing import Any, Dict
+import json
+from typing import (
+    IO,
+    Annotated,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Set,
+)
 
 from beanie import PydanticObjectId
-from beanie.exceptions import RevisionIdWasChanged
-from beanie.operators import Set
-from fastapi import APIRouter, Body, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
 
 from ..auth.jwt_handler import AuthHandler
-from ..exceptions import PartNotFoundException
-from ..models.part import Part, UpdatePart
+from ..bookkeeping import record_write
+from ..bulk import delete_parts, insert_parts, update_parts
+from ..cache.response_cache import response_cache
+from ..cache.serial_index import serial_index
+from ..config import settings
+from ..etag import document_response
+from ..exceptions import InsufficientStockException, PartNotFoundException
+from ..importer import RowReader, get_row_reader, import_parts, spool_upload
+from ..models.part import (
+    BulkDeleteParts,
+    BulkUpdateParts,
+    Part,
+    PartFilter,
+    SerialStockAdjustment,
+    StockAdjustment,
+    UpdatePart,
+    validate_part_category,
+)
+from ..negotiation import NegotiatedRoute
+from ..responses import ModelResponse
+from ..stock import (
+    adjust_stock,
+    adjust_stock_many,
+    existing_serial_numbers,
+    part_exists,
+)
+from ..streaming import NDJSON_MEDIA_TYPE, ExportFormat, export_response
 
 auth_handler: AuthHandler = AuthHandler()
-router: APIRouter = APIRouter()
+router: APIRouter = APIRouter(route_class=NegotiatedRoute)
+
+
+@router.get(
+    "/export",
+    response_description="Export all matching parts as a CSV or JSONL file",
+)
+async def export_parts(
+    filters: Annotated[PartFilter, Depends()],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "csv",
+    gzip: bool = False,
+):
+    return export_response(Part, filters.to_query(), export_format, gzip)
 
 
 @router.get(
     "/{part_id}",
     response_description="Get single part",
 )
-async def get_part(part_id: PydanticObjectId):
-    part: Part = await Part.get(part_id)
-    if part is not None:
-        return JSONResponse(
-            {"message": f"Part {str(part_id)} retrieved", "data": part.model_dump()}
-        )
-    raise PartNotFoundException(part_id)
+async def get_part(
+    part_id: PydanticObjectId,
+    fields: Optional[str] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    response: Optional[Response] = await document_response(
+        Part, part_id, fields, if_none_match, f"Part {str(part_id)} retrieved"
+    )
+    if response is None:
+        raise PartNotFoundException(part_id)
+    return response
 
 
 @router.post(
@@ -40,49 +101,261 @@ async def create_part(part: Part):
             status_code=status.HTTP_409_CONFLICT,
             detail=f'Part with {e.details.get("keyValue")} already exists',
         )
-    created_part: Part = await Part.get(new_part.id)
-    return JSONResponse(
+    serial_index.add(new_part.serial_number)
+    await record_write(
+        [Part.get_collection_name()], {"part_count": {new_part.category: 1}}
+    )
+    return ModelResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": f"Part {new_part.id} created",
-            "data": created_part.model_dump(),
+            "data": new_part,
         },
     )
 
 
-@router.put("/{part_id}", response_description="Update part")
-async def update_part(part_id: PydanticObjectId, data: UpdatePart = Body(...)):
-    part: Part = await Part.find_one({"_id": part_id})
-    if not part:
-        raise PartNotFoundException(part_id)
-    if data.location:
-        data.location = part.location.model_copy(
-            update=data.location.model_dump(exclude_none=True)
+@router.post(
+    "/bulk",
+    response_description="Create many parts",
+)
+async def create_parts_bulk(
+    rows: Annotated[List[Dict[str, Any]], Body(max_length=settings.BULK_MAX_ITEMS)]
+):
+    results: List[Dict[str, Any]] = await insert_parts(rows)
+    created: int = sum(result["status"] == "created" for result in results)
+    return ModelResponse(
+        status_code=(
+            status.HTTP_201_CREATED
+            if created == len(results)
+            else status.HTTP_207_MULTI_STATUS
+        ),
+        content={
+            "message": f"{created} of {len(results)} parts created",
+            "data": results,
+        },
+    )
+
+
+@router.post(
+    "/bulk/update",
+    response_description="Update all parts matching filter",
+)
+async def update_parts_bulk(data: BulkUpdateParts):
+    query: Dict[str, Any] = data.filter.to_query()
+    update: Dict[str, Any] = data.update.to_update()
+    if not query or not update:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+    if data.update.price is not None and data.update.price_change_percent is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not set price and change it by percent at once",
         )
-    update_data: Dict[str, Any] = data.model_dump(exclude_none=True)
-    if not update_data:
+    matched: int
+    modified: int
+    matched, modified = await update_parts(query, update, data.update.category)
+    return ModelResponse(
+        {
+            "message": f"{modified} of {matched} parts updated",
+            "data": {"matched": matched, "modified": modified},
+        }
+    )
+
+
+@router.post(
+    "/bulk/delete",
+    response_description="Delete all parts matching filter",
+)
+async def delete_parts_bulk(data: BulkDeleteParts):
+    query: Dict[str, Any] = data.filter.to_query()
+    if not query:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
-    try:
-        updated_part: Part = await part.update(Set(update_data))
-    except (DuplicateKeyError, RevisionIdWasChanged):
+    deleted: int = await delete_parts(query)
+    return ModelResponse(
+        {"message": f"{deleted} parts deleted", "data": {"deleted": deleted}}
+    )
+
+
+@router.post(
+    "/import",
+    response_description="Import parts from a CSV or JSONL file",
+)
+async def import_parts_file(file: UploadFile):
+    reader: Optional[RowReader] = get_row_reader(file.filename, file.content_type)
+    if reader is None:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Part with this serial number already exists",
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Import file must be CSV or JSONL",
         )
-    if updated_part is not None:
-        return JSONResponse(
+    lines: IO[str] = await run_in_threadpool(spool_upload, file.file)
+    return StreamingResponse(
+        _import_events(reader, lines), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+async def _import_events(reader: RowReader, lines: IO[str]) -> AsyncIterator[bytes]:
+    events: AsyncGenerator[Dict[str, Any], None] = import_parts(
+        reader(lines), settings.IMPORT_BATCH_SIZE, settings.IMPORT_MAX_IN_FLIGHT
+    )
+    try:
+        async for event in events:
+            yield json.dumps(event).encode() + b"\n"
+    finally:
+        # Closing the import cancels its in-flight batches on disconnect
+        await events.aclose()
+        lines.close()
+
+
+@router.post(
+    "/adjust",
+    response_description="Adjust stock of many parts by serial number",
+)
+async def adjust_stock_bulk(
+    adjustments: Annotated[
+        List[SerialStockAdjustment], Body(max_length=settings.BULK_MAX_ITEMS)
+    ]
+):
+    quantities: List[Optional[int]] = await adjust_stock_many(
+        [
+            ({"serial_number": adjustment.serial_number}, adjustment.delta)
+            for adjustment in adjustments
+        ],
+        settings.BULK_ADJUST_MAX_IN_FLIGHT,
+    )
+    # One lookup tells missing parts from insufficient stock for all failures
+    existing: Set[str] = await existing_serial_numbers(
+        [
+            adjustment.serial_number
+            for adjustment, quantity in zip(adjustments, quantities)
+            if quantity is None
+        ]
+    )
+    results: List[Dict[str, Any]] = [
+        _adjustment_result(index, adjustment, quantity, existing)
+        for index, (adjustment, quantity) in enumerate(zip(adjustments, quantities))
+    ]
+    adjusted: int = sum(result["status"] == "adjusted" for result in results)
+    return ModelResponse(
+        status_code=(
+            status.HTTP_200_OK
+            if adjusted == len(results)
+            else status.HTTP_207_MULTI_STATUS
+        ),
+        content={
+            "message": f"{adjusted} of {len(results)} stock adjustments applied",
+            "data": results,
+        },
+    )
+
+
+def _adjustment_result(
+    index: int,
+    adjustment: SerialStockAdjustment,
+    quantity: Optional[int],
+    existing: Set[str],
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "index": index,
+        "serial_number": adjustment.serial_number,
+    }
+    if quantity is not None:
+        return {**result, "status": "adjusted", "quantity": quantity}
+    detail: str = (
+        "Insufficient stock"
+        if adjustment.serial_number in existing
+        else "Part not found"
+    )
+    return {**result, "status": "error", "detail": detail}
+
+
+@router.post("/{part_id}/adjust", response_description="Adjust part stock")
+async def adjust_part_stock(part_id: PydanticObjectId, adjustment: StockAdjustment):
+    query: Dict[str, Any] = {"_id": part_id}
+    quantity: Optional[int] = await adjust_stock(query, adjustment.delta)
+    if quantity is not None:
+        return ModelResponse(
             {
-                "message": f"Part {str(part_id)} updated",
-                "data": updated_part.model_dump(),
+                "message": f"Part {str(part_id)} stock adjusted",
+                "data": {"id": str(part_id), "quantity": quantity},
             }
         )
+    if await part_exists(query):
+        raise InsufficientStockException(part_id)
     raise PartNotFoundException(part_id)
 
 
+@router.put("/{part_id}", response_description="Update part")
+async def update_part(part_id: PydanticObjectId, data: UpdatePart = Body(...)):
+    if not data.model_dump(exclude_none=True):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+    update: Dict[str, Any] = data.to_update()
+    if not update:
+        # An empty location is a valid update that changes nothing
+        return await _unchanged_part(part_id)
+    if data.category is not None:
+        await validate_part_category(data.category)
+    try:
+        # The document before the update tells which serial number and category
+        # the part leaves, and applying the update to it gives the new document
+        old_part: Optional[
+            Dict[str, Any]
+        ] = await Part.get_motor_collection().find_one_and_update(
+            {"_id": part_id}, update, return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Part with this serial number already exists",
+        )
+    if old_part is None:
+        raise PartNotFoundException(part_id)
+    old_serial_number: str = old_part["serial_number"]
+    old_category: str = old_part["category"]
+    updated_part: Part = Part.model_validate(_apply_set(old_part, update["$set"]))
+    serial_index.replace(old_serial_number, updated_part.serial_number)
+    deltas: Dict[Optional[str], int] = (
+        {old_category: -1, updated_part.category: 1}
+        if updated_part.category != old_category
+        else {}
+    )
+    await record_write([Part.get_collection_name()], {"part_count": deltas})
+    await response_cache.delete(Part.get_collection_name(), [str(part_id)])
+    return ModelResponse(
+        {
+            "message": f"Part {str(part_id)} updated",
+            "data": updated_part,
+        }
+    )
+
+
+async def _unchanged_part(part_id: PydanticObjectId) -> ModelResponse:
+    part: Optional[Part] = await Part.find_one({"_id": part_id})
+    if part is None:
+        raise PartNotFoundException(part_id)
+    return ModelResponse({"message": f"Part {str(part_id)} updated", "data": part})
+
+
+def _apply_set(document: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in fields.items():
+        target: Dict[str, Any] = document
+        *parents, field = key.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[field] = value
+    return document
+
+
 @router.delete("/{part_id}", response_description="Delete part")
 async def delete_part(part_id: PydanticObjectId):
-    part: Part = await Part.get(part_id)
-    if not part:
+    part: Optional[
+        Dict[str, Any]
+    ] = await Part.get_motor_collection().find_one_and_delete(
+        {"_id": part_id}, projection={"serial_number": 1, "category": 1}
+    )
+    if part is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-    await part.delete()
-    return JSONResponse({"message": f"Part {str(part_id)} deleted"})
+    serial_index.remove(part["serial_number"])
+    await record_write(
+        [Part.get_collection_name()], {"part_count": {part["category"]: -1}}
+    )
+    await response_cache.delete(Part.get_collection_name(), [str(part_id)])
+    return ModelResponse({"message": f"Part {str(part_id)} deleted"})
@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ..models.category import Category
+from ..models.part import Part
+
+router: APIRouter = APIRouter()
+
+TOTALS: List[str] = ["part_count", "total_quantity", "total_value"]
+
+
+@router.get("/valuation", response_description="Stock value per category")
+async def get_valuation():
+    groups: List[Dict[str, Any]] = await Part.aggregate(
+        [
+            {
+                "$group": {
+                    "_id": "$category",
+                    "part_count": {"$sum": 1},
+                    "total_quantity": {"$sum": "$quantity"},
+                    "total_value": {"$sum": {"$multiply": ["$quantity", "$price"]}},
+                }
+            }
+        ]
+    ).to_list()
+    parents: Dict[str, Optional[str]] = {
+        category["name"]: category.get("parent_name")
+        async for category in Category.get_motor_collection().find(
+            {}, {"_id": 0, "name": 1, "parent_name": 1}
+        )
+    }
+    report: Dict[str, Dict[str, Any]] = {
+        name: _valuation_row(name, parent_name) for name, parent_name in parents.items()
+    }
+    for group in groups:
+        row: Dict[str, Any] = report.setdefault(
+            group["_id"], _valuation_row(group["_id"], None)
+        )
+        for key in TOTALS:
+            row[key] = group[key]
+        _roll_up(report, parents, row)
+    grand_total: Dict[str, Any] = {
+        key: sum(group[key] for group in groups) for key in TOTALS
+    }
+    return JSONResponse(
+        {
+            "data": [_rounded(row) for row in report.values()],
+            "total": _rounded(grand_total),
+        }
+    )
+
+
+def _valuation_row(name: str, parent_name: Optional[str]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"category": name, "parent_name": parent_name}
+    for key in TOTALS:
+        row[key] = 0
+        row[f"rollup_{key}"] = 0
+    return row
+
+
+def _roll_up(
+    report: Dict[str, Dict[str, Any]],
+    parents: Dict[str, Optional[str]],
+    row: Dict[str, Any],
+) -> None:
+    visited: set = set()
+    name: Optional[str] = row["category"]
+    while name is not None and name in report and name not in visited:
+        visited.add(name)
+        for key in TOTALS:
+            report[name][f"rollup_{key}"] += row[key]
+        name = parents.get(name)
+
+
+def _rounded(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: round(value, 2) if isinstance(value, float) else value
+        for key, value in row.items()
+    }
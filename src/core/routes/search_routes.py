@@ -1,23 +1,158 @@
-from typing import List
+from typing import Annotated, Any, Dict, List, Optional, Type
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from beanie.odm.utils.projection import get_projection
+from fastapi import APIRouter, Depends, Header, Query, Request
+from pydantic import BaseModel
 
 from ..auth.jwt_handler import AuthHandler
+from ..cache.serial_index import serial_index
+from ..config import settings
+from ..etag import etag_matches, list_etag, not_modified
 from ..models.category import Category
-from ..models.part import Part
+from ..models.part import Part, PartFilter
+from ..negotiation import NegotiatedRoute
+from ..pagination import (
+    PageLimit,
+    after_cursor,
+    decode_score_cursor,
+    encode_cursor,
+    paginate,
+)
+from ..projection import parse_fields
+from ..responses import ModelResponse
+from ..streaming import ndjson_response, wants_ndjson
 
 auth_handler: AuthHandler = AuthHandler()
-router: APIRouter = APIRouter()
+router: APIRouter = APIRouter(route_class=NegotiatedRoute)
 
 
-@router.get("/parts", response_description="List all parts")
-async def list_parts():
-    parts: List[Part] = await Part.all().to_list()
-    return JSONResponse({"data": [part.model_dump() for part in parts]})
+@router.get(
+    "/parts", response_description="List parts page or stream all matching parts"
+)
+async def list_parts(
+    request: Request,
+    filters: Annotated[PartFilter, Depends()],
+    limit: PageLimit = settings.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    stream: bool = False,
+    accept: Annotated[Optional[str], Header()] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    query: Dict[str, Any] = filters.to_query()
+    projection: Optional[Type[BaseModel]] = parse_fields(Part, fields)
+    if wants_ndjson(accept, stream):
+        return ndjson_response(Part, after_cursor(query, cursor), projection)
+    etag: str = await list_etag(request, Part.get_collection_name())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    parts: List[BaseModel]
+    parts, next_cursor = await paginate(Part, query, limit, cursor, projection)
+    return ModelResponse(
+        {"data": parts, "next_cursor": next_cursor},
+        headers={"ETag": etag},
+    )
 
 
-@router.get("/categories", response_description="List all categories")
-async def list_categories():
-    categories: List[Category] = await Category.all().to_list()
-    return JSONResponse({"data": [category.model_dump() for category in categories]})
+@router.get("/parts/text", response_description="Search parts by name and description")
+async def search_parts_text(
+    request: Request,
+    q: Annotated[str, Query(min_length=1)],
+    filters: Annotated[PartFilter, Depends()],
+    limit: PageLimit = settings.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    etag: str = await list_etag(request, Part.get_collection_name())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    projection: Type[BaseModel] = parse_fields(Part, fields) or Part
+    results: List[Dict[str, Any]] = await Part.aggregate(
+        _text_search_pipeline(q, filters.to_query(), limit, cursor, projection)
+    ).to_list()
+    next_cursor: Optional[str] = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_cursor(results[-1]["score"], results[-1]["_id"])
+    return ModelResponse(
+        {
+            "data": [
+                {
+                    **projection.model_validate(result).model_dump(),
+                    "score": result["score"],
+                }
+                for result in results
+            ],
+            "next_cursor": next_cursor,
+        },
+        headers={"ETag": etag},
+    )
+
+
+def _text_search_pipeline(
+    q: str,
+    query: Dict[str, Any],
+    limit: int,
+    cursor: Optional[str],
+    projection: Type[BaseModel],
+) -> List[Dict[str, Any]]:
+    # Relevance order is (score desc, _id asc), so the cursor carries both keys
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"$text": {"$search": q}, **query}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor is not None:
+        score, last_id = decode_score_cursor(cursor)
+        pipeline.append(
+            {
+                "$match": {
+                    "$or": [
+                        {"score": {"$lt": score}},
+                        {"score": score, "_id": {"$gt": last_id}},
+                    ]
+                }
+            }
+        )
+    pipeline += [{"$sort": {"score": -1, "_id": 1}}, {"$limit": limit + 1}]
+    fields: Optional[Dict[str, int]] = get_projection(projection)
+    if fields:
+        pipeline.append({"$project": {**fields, "score": 1}})
+    return pipeline
+
+
+@router.get("/parts/autocomplete", response_description="Complete part serial numbers")
+async def autocomplete_serial_numbers(
+    prefix: Annotated[str, Query(min_length=1)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+):
+    return ModelResponse({"data": serial_index.complete(prefix, limit)})
+
+
+@router.get(
+    "/categories", response_description="List categories page or stream all categories"
+)
+async def list_categories(
+    request: Request,
+    limit: PageLimit = settings.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    stream: bool = False,
+    accept: Annotated[Optional[str], Header()] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    projection: Optional[Type[BaseModel]] = parse_fields(Category, fields)
+    if wants_ndjson(accept, stream):
+        return ndjson_response(Category, after_cursor({}, cursor), projection)
+    etag: str = await list_etag(request, Category.get_collection_name())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    categories: List[BaseModel]
+    categories, next_cursor = await paginate(Category, {}, limit, cursor, projection)
+    return ModelResponse(
+        {
+            "data": categories,
+            "next_cursor": next_cursor,
+        },
+        headers={"ETag": etag},
+    )
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from pymongo import ReturnDocument
+
+from .bookkeeping import record_write
+from .cache.response_cache import response_cache
+from .models.part import Part
+
+StockAdjustments = Sequence[Tuple[Dict[str, Any], int]]
+
+
+async def adjust_stock(query: Dict[str, Any], delta: int) -> Optional[int]:
+    """Add `delta` to the quantity of the part matching `query`.
+
+    The change is a single conditional `$inc`, so concurrent adjustments never
+    overwrite each other and a decrement larger than the stock matches nothing.
+    Returns the new quantity, or None if the part is missing or the stock is
+    insufficient.
+    """
+    quantities: List[Optional[int]] = await adjust_stock_many([(query, delta)], 1)
+    return quantities[0]
+
+
+async def adjust_stock_many(
+    adjustments: StockAdjustments, max_in_flight: int
+) -> List[Optional[int]]:
+    """Apply every (query, delta) adjustment, returning the new quantities in order.
+
+    At most `max_in_flight` adjustments are written at once, and the version
+    bump and cache invalidation run once for the whole batch afterwards.
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def bounded(query: Dict[str, Any], delta: int) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _increment_quantity(query, delta)
+
+    documents: List[Optional[Dict[str, Any]]] = await asyncio.gather(
+        *(bounded(query, delta) for query, delta in adjustments)
+    )
+    adjusted: List[str] = [
+        str(document["_id"]) for document in documents if document is not None
+    ]
+    if adjusted:
+        await record_write([Part.get_collection_name()])
+        await response_cache.delete(Part.get_collection_name(), adjusted)
+    return [
+        None if document is None else document["quantity"] for document in documents
+    ]
+
+
+async def _increment_quantity(
+    query: Dict[str, Any], delta: int
+) -> Optional[Dict[str, Any]]:
+    condition: Dict[str, Any] = {"quantity": {"$gte": -delta}} if delta < 0 else {}
+    return await Part.get_motor_collection().find_one_and_update(
+        {**query, **condition},
+        {"$inc": {"quantity": delta}},
+        projection={"quantity": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def part_exists(query: Dict[str, Any]) -> bool:
+    return await Part.get_motor_collection().count_documents(query, limit=1) > 0
+
+
+async def existing_serial_numbers(serial_numbers: List[str]) -> Set[str]:
+    return {
+        document["serial_number"]
+        async for document in Part.get_motor_collection().find(
+            {"serial_number": {"$in": serial_numbers}}, {"serial_number": 1}
+        )
+    }
@@ -0,0 +1,174 @@
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple, Type
+
+from beanie import Document
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+from .config import settings
+from .negotiation import accepted_media_types
+
+NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+EXPORT_MEDIA_TYPES: Dict[str, str] = {"csv": "text/csv", "jsonl": NDJSON_MEDIA_TYPE}
+
+ExportFormat = Literal["csv", "jsonl"]
+
+
+def wants_ndjson(accept: Optional[str], stream: bool) -> bool:
+    """Stream when asked to, or when NDJSON is the client's preferred format.
+
+    Media ranges are ranked like `negotiate_media_type` does: quality first,
+    then an exact type over a wildcard, then the first one listed.
+    """
+    candidates: List[Tuple[float, bool, int, str]] = [
+        (quality, "*" not in name, -position, name)
+        for position, (name, quality) in enumerate(accepted_media_types(accept))
+        if quality > 0
+    ]
+    return stream or (bool(candidates) and max(candidates)[-1] == NDJSON_MEDIA_TYPE)
+
+
+async def iter_ndjson(
+    document: Type[Document],
+    query: Dict[str, Any],
+    batch_size: int,
+    projection: Optional[Type[BaseModel]] = None,
+) -> AsyncIterator[bytes]:
+    rows: List[bytes] = []
+    async for item in document.find(
+        query, projection_model=projection or document, batch_size=batch_size
+    ).sort("_id"):
+        rows.append(item.model_dump_json().encode())
+        if len(rows) == batch_size:
+            yield b"\n".join(rows) + b"\n"
+            rows = []
+    if rows:
+        yield b"\n".join(rows) + b"\n"
+
+
+def ndjson_response(
+    document: Type[Document],
+    query: Dict[str, Any],
+    projection: Optional[Type[BaseModel]] = None,
+) -> StreamingResponse:
+    """Stream every document matching `query` as one JSON object per line.
+
+    Documents are pulled from the Motor cursor `STREAM_BATCH_SIZE` at a time and
+    flushed per batch, so memory stays bounded however large the collection is.
+    """
+    return StreamingResponse(
+        iter_ndjson(document, query, settings.STREAM_BATCH_SIZE, projection),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+def export_columns(document: Type[Document]) -> List[str]:
+    columns: List[str] = ["id"]
+    for name, field in document.model_fields.items():
+        if name in ("id", "revision_id"):
+            continue
+        if isinstance(field.annotation, type) and issubclass(
+            field.annotation, BaseModel
+        ):
+            columns.extend(
+                f"{name}.{nested}" for nested in field.annotation.model_fields
+            )
+        else:
+            columns.append(name)
+    return columns
+
+
+async def iter_raw_batches(
+    document: Type[Document], query: Dict[str, Any], batch_size: int
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    async for raw in (
+        document.get_motor_collection()
+        .find(query, {"revision_id": 0}, batch_size=batch_size)
+        .sort("_id", ASCENDING)
+    ):
+        raw["id"] = str(raw.pop("_id"))
+        batch.append(raw)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def iter_csv(
+    batches: AsyncIterator[List[Dict[str, Any]]], columns: List[str]
+) -> AsyncIterator[bytes]:
+    buffer: io.StringIO = io.StringIO()
+    writer: Any = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows([_flat_row(raw, columns) for raw in batch])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def iter_jsonl(
+    batches: AsyncIterator[List[Dict[str, Any]]]
+) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(json.dumps(raw, default=str) + "\n" for raw in batch).encode()
+
+
+async def iter_gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor: Any = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed: bytes = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    document: Type[Document],
+    query: Dict[str, Any],
+    export_format: ExportFormat,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """Stream every document matching `query` as a CSV or JSONL file.
+
+    Raw documents come straight off the Motor cursor without building models,
+    nested models are flattened into `name.field` CSV columns, and each batch is
+    encoded (and optionally gzipped) as it arrives, so memory stays constant.
+    """
+    batches: AsyncIterator[List[Dict[str, Any]]] = iter_raw_batches(
+        document, query, settings.STREAM_BATCH_SIZE
+    )
+    chunks: AsyncIterator[bytes] = (
+        iter_csv(batches, export_columns(document))
+        if export_format == "csv"
+        else iter_jsonl(batches)
+    )
+    filename: str = f"{document.get_collection_name()}.{export_format}"
+    media_type: str = EXPORT_MEDIA_TYPES[export_format]
+    if gzip:
+        chunks = iter_gzip(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _flat_row(raw: Dict[str, Any], columns: List[str]) -> List[Any]:
+    row: List[Any] = []
+    for column in columns:
+        value: Any = raw
+        for key in column.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        row.append(value)
+    return row
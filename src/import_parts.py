@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import json
+import sys
+from typing import IO, Any, Dict, Optional
+
+from core.config import settings
+from core.database import Database
+from core.importer import RowReader, get_row_reader, import_parts
+
+
+async def run_import(path: str, batch_size: int, max_in_flight: int) -> int:
+    reader: Optional[RowReader] = get_row_reader(path, None)
+    if reader is None:
+        print(f"{path}: import file must be CSV or JSONL", file=sys.stderr)
+        return 2
+    await Database().init_db()
+    errors_path: str = f"{path}.errors.jsonl"
+    summary: Dict[str, Any] = {}
+    lines: IO[str]
+    errors: IO[str]
+    with open(path, encoding="utf-8-sig", newline="") as lines, open(
+        errors_path, "w"
+    ) as errors:
+        async for event in import_parts(reader(lines), batch_size, max_in_flight):
+            if event["type"] == "error":
+                errors.write(json.dumps(event) + "\n")
+            elif event["type"] == "progress":
+                print(
+                    f"{event['processed']} rows processed, {event['failed']} failed",
+                    file=sys.stderr,
+                )
+            else:
+                summary = event
+    print(json.dumps(summary))
+    if summary["failed"] or summary["aborted"]:
+        print(f"Row errors written to {errors_path}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Import parts from a CSV or JSONL file"
+    )
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument(
+        "--max-in-flight", type=int, default=settings.IMPORT_MAX_IN_FLIGHT
+    )
+    args: argparse.Namespace = parser.parse_args()
+    sys.exit(asyncio.run(run_import(args.path, args.batch_size, args.max_in_flight)))
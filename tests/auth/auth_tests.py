@@ -1,10 +1,16 @@
-from typing import Dict
+from typing import Any, Dict
 from unittest.mock import ANY
 
 import pytest
+from beanie.operators import Set
 from fastapi import status
 from httpx import AsyncClient, Response
 
+from src.core.app import auth_handler
+from src.core.auth.jwt_handler import AuthHandler
+from src.core.cache.revocation import RevocationList, revocation_list
+from src.core.cache.token_cache import token_cache
+from src.core.config import settings
 from src.core.models.auth.user import User
 
 
@@ -40,6 +46,22 @@ async def test_get_token_incorrect_user(client: AsyncClient):
     assert response.json() == expected_response
 
 
+@pytest.mark.anyio
+async def test_get_token_hash_pool_full(client: AsyncClient, user: User, mocker):
+    # Arrange
+    data: str = f"username={user['username']}&password={user['password']}"
+    headers: Dict[str, str] = {
+        "accept": "application/json",
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+    mocker.patch.object(AuthHandler, "pending_hashes", AuthHandler.hash_capacity)
+    # Act
+    response: Response = await client.post("/auth/token", content=data, headers=headers)
+    # Assert
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "1"
+
+
 @pytest.mark.anyio
 async def test_register_new_user(client: AsyncClient):
     # Arrange
@@ -107,7 +129,8 @@ async def test_register_existing_email(client: AsyncClient, user: User):
 
 
 @pytest.mark.parametrize(
-    "endpoint", ("/categories/123", "/parts/123", "/search/parts", "search/categories")
+    "endpoint",
+    ("/categories/123", "/parts/123", "/search/parts", "search/categories", "/metrics"),
 )
 @pytest.mark.anyio
 async def test_GET_endpoints_valid_token(
@@ -129,7 +152,8 @@ async def test_GET_endpoints_valid_token(
 
 
 @pytest.mark.parametrize(
-    "endpoint", ("/categories/123", "/parts/123", "/search/parts", "search/categories")
+    "endpoint",
+    ("/categories/123", "/parts/123", "/search/parts", "search/categories", "/metrics"),
 )
 @pytest.mark.anyio
 async def test_GET_endpoints_expired_token(
@@ -208,3 +232,104 @@ async def test_DELETE_endpoints_expired_token(
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
     assert response.json() == expected_response
+
+
+@pytest.mark.anyio
+async def test_verify_token_cached(client: AsyncClient, token: str, mocker):
+    # Arrange
+    headers: Dict[str, str] = {"Authorization": f"Bearer {token}"}
+    find_user = mocker.spy(User, "find_one")
+    hits: int = token_cache.hits
+    # Act
+    first_response: Response = await client.get("/search/parts", headers=headers)
+    second_response: Response = await client.get("/search/parts", headers=headers)
+    # Assert
+    assert first_response.status_code == status.HTTP_200_OK
+    assert second_response.status_code == status.HTTP_200_OK
+    assert find_user.call_count == 1
+    assert token_cache.hits == hits + 1
+    assert "password" not in token_cache.get(token).model_dump()
+
+
+@pytest.mark.anyio
+async def test_verify_token_cache_invalidated_on_user_change(
+    client: AsyncClient, user: Dict[str, Any], token: str
+):
+    # Arrange
+    headers: Dict[str, str] = {"Authorization": f"Bearer {token}"}
+    await client.get("/search/parts", headers=headers)
+    db_user: User = await User.get(user["user_id"])
+    # Act
+    await db_user.update(Set({User.username: "renamed"}))
+    cached_user_after_update = token_cache.get(token)
+    await db_user.delete()
+    response: Response = await client.get("/search/parts", headers=headers)
+    # Assert
+    assert cached_user_after_update is None
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_verify_token_stateless(
+    client: AsyncClient, user: Dict[str, Any], mocker
+):
+    # Arrange
+    mocker.patch.object(settings, "STATELESS_TOKENS", True)
+    token: str = auth_handler.encode_token(
+        user["user_id"], claims={"username": user["username"], "email": user["email"]}
+    )
+    headers: Dict[str, str] = {"Authorization": f"Bearer {token}"}
+    find_user = mocker.spy(User, "find_one")
+    # Act
+    response: Response = await client.get("/search/parts", headers=headers)
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert find_user.call_count == 0
+
+
+@pytest.mark.anyio
+async def test_verify_token_stateless_disabled_user(
+    client: AsyncClient, user: Dict[str, Any], mocker
+):
+    # Arrange
+    mocker.patch.object(settings, "STATELESS_TOKENS", True)
+    token: str = auth_handler.encode_token(
+        user["user_id"], claims={"username": user["username"], "email": user["email"]}
+    )
+    headers: Dict[str, str] = {"Authorization": f"Bearer {token}"}
+    await User.get_motor_collection().update_one(
+        {"_id": user["user_id"]}, {"$set": {"disabled": True}}
+    )
+    # Act
+    response_before_refresh: Response = await client.get(
+        "/search/parts", headers=headers
+    )
+    await revocation_list.refresh()
+    response_after_refresh: Response = await client.get(
+        "/search/parts", headers=headers
+    )
+    # Assert
+    assert response_before_refresh.status_code == status.HTTP_200_OK
+    assert response_after_refresh.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_revocation_list_refresh_deleted_user(
+    client: AsyncClient, user: Dict[str, Any]
+):
+    # Arrange
+    db_user: User = await User.get(user["user_id"])
+    await db_user.delete()
+    other_worker: RevocationList = RevocationList()
+    # Act
+    await other_worker.refresh()
+    # Assert
+    assert other_worker.is_revoked(user["user_id"])
+
+
+@pytest.mark.anyio
+async def test_metrics_requires_token(client: AsyncClient):
+    # Act
+    response: Response = await client.get("/metrics")
+    # Assert
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,122 @@
+import gzip
+import zlib
+from typing import AsyncIterator, Dict, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import AsyncClient
+from httpx import Response as HTTPXResponse
+
+from src.core.compression import CompressionMiddleware, accepts_gzip
+
+BODY: bytes = b'{"name": "Widget"}' * 200
+
+
+def make_app(offload_size: int = 1 << 20) -> FastAPI:
+    app: FastAPI = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,  # type: ignore
+        minimum_size=1024,
+        offload_size=offload_size,
+    )
+
+    @app.get("/large")
+    async def large():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"a"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("small")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(BODY), headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(5):
+                yield b"row\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, False),
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("identity", False),
+        ("*", True),
+        ("br", False),
+        ("*;q=1, gzip;q=0", False),
+        ("gzip;q=0.5, *;q=0", True),
+    ],
+)
+def test_accepts_gzip(accept_encoding: Optional[str], expected: bool):
+    # Act
+    result: bool = accepts_gzip(accept_encoding)
+    # Assert
+    assert result is expected
+
+
+@pytest.mark.parametrize("offload_size", [1 << 20, 1])
+@pytest.mark.anyio
+async def test_large_response_compressed(offload_size: int):
+    # Arrange
+    async with AsyncClient(app=make_app(offload_size), base_url="http://test") as ac:
+        # Act
+        response: HTTPXResponse = await ac.get("/large")
+    # Assert
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"a"'
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize(
+    "path, headers",
+    [
+        ("/small", {}),
+        ("/large", {"Accept-Encoding": "identity"}),
+        ("/large", {"Accept-Encoding": "gzip;q=0"}),
+    ],
+)
+@pytest.mark.anyio
+async def test_response_not_compressed(path: str, headers: Dict[str, str]):
+    # Arrange
+    async with AsyncClient(app=make_app(), base_url="http://test") as ac:
+        # Act
+        response: HTTPXResponse = await ac.get(path, headers=headers)
+    # Assert
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_encoded_response_passed_through():
+    # Arrange
+    async with AsyncClient(app=make_app(), base_url="http://test") as ac:
+        # Act
+        response: HTTPXResponse = await ac.get("/encoded")
+    # Assert
+    assert response.content == BODY
+    assert "vary" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_streaming_response_compressed():
+    # Arrange
+    async with AsyncClient(app=make_app(), base_url="http://test") as ac:
+        # Act
+        async with ac.stream("GET", "/stream") as response:
+            raw: bytes = b"".join([chunk async for chunk in response.aiter_raw()])
+    # Assert
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(raw, zlib.MAX_WBITS | 16) == b"row\n" * 5
@@ -142,6 +142,7 @@ async def parts(categories):
     parts: InsertManyResult = await Part.insert_many(
         [Part(**part) for part in parts_data]
     )
+    await Category.rebuild_counters()
     yield parts
 
 
@@ -160,4 +161,5 @@ async def categories():
     categories: InsertManyResult = await Category.insert_many(
         [Category(**category) for category in category_data]
     )
+    await Category.rebuild_counters()
     yield categories
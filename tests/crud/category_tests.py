@@ -71,6 +71,76 @@ class TestCategoryNoAuth:
         assert response.status_code == status.HTTP_200_OK
         assert total_categories == len(response.json()["data"])
 
+    @pytest.mark.anyio
+    async def test_get_categories_paginated(
+        self, client: AsyncClient, categories: InsertManyResult
+    ):
+        # Arrange
+        total_categories: int = len(categories.inserted_ids)
+        # Act
+        first_page: Response = await client.get(
+            "/search/categories", params={"limit": total_categories - 1}
+        )
+        last_page: Response = await client.get(
+            "/search/categories",
+            params={"cursor": first_page.json()["next_cursor"]},
+        )
+        # Assert
+        assert len(first_page.json()["data"]) == total_categories - 1
+        assert len(last_page.json()["data"]) == 1
+        assert last_page.json()["data"][0]["id"] == str(categories.inserted_ids[-1])
+        assert last_page.json()["next_cursor"] is None
+
+    @pytest.mark.anyio
+    async def test_get_category_tree(
+        self, client: AsyncClient, categories: InsertManyResult
+    ):
+        # Arrange
+        await Category(name="DeepTools", parent_name="SubTools").create()
+        tools: Category = await Category.find_one({"name": "Tools"})
+        # Act
+        response: Response = await client.get(f"/categories/{tools.id}/tree")
+        tree: Dict[str, Any] = response.json()["data"]
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert tree["name"] == "Tools"
+        assert [child["name"] for child in tree["children"]] == [
+            "SubTools",
+            "SubTools2",
+        ]
+        assert tree["children"][0]["children"][0]["name"] == "DeepTools"
+        assert tree["children"][0]["children"][0]["children"] == []
+
+    @pytest.mark.anyio
+    async def test_list_category_subtree_parts(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        tools: Category = await Category.find_one({"name": "Tools"})
+        # Act
+        response: Response = await client.get(
+            f"/categories/{tools.id}/parts", params={"fields": "serial_number"}
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert [part["serial_number"] for part in response.json()["data"]] == [
+            "ABC123",
+            "DEF456",
+            "GHI789",
+        ]
+
+    @pytest.mark.parametrize("endpoint", ["tree", "parts"])
+    @pytest.mark.anyio
+    async def test_category_subtree_do_not_exist(
+        self, client: AsyncClient, categories: InsertManyResult, endpoint: str
+    ):
+        # Arrange
+        category_id: PydanticObjectId = PydanticObjectId()
+        # Act
+        response: Response = await client.get(f"/categories/{category_id}/{endpoint}")
+        # Assert
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     @pytest.mark.parametrize(
         "data",
         [{"name": "Category"}, {"name": "Category 1", "parent_name": "Tools"}],
@@ -1,13 +1,21 @@
+import asyncio
+import csv
+import gzip
+import io
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import pytest
 from beanie import PydanticObjectId
 from fastapi import status
 from httpx import AsyncClient, Response
+from pymongo.errors import ServerSelectionTimeoutError
 from pymongo.results import InsertManyResult
 
-from src.core.models.part import Part
+from src.core import importer, stock
+from src.core.config import settings
+from src.core.models.category import Category
+from src.core.models.part import BulkPartUpdate, Part
 
 from ..conftest import mock_no_authentication
 
@@ -28,6 +36,44 @@ class TestPartsNoAuth:
         assert response.status_code == status.HTTP_200_OK
         assert json.loads(response.content)["message"] == expected_message
 
+    @pytest.mark.parametrize(
+        "fields, expected_keys",
+        [
+            ("serial_number,quantity", {"id", "serial_number", "quantity"}),
+            ("id, location", {"id", "location"}),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_get_single_part_fields(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        fields: str,
+        expected_keys: set,
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        # Act
+        response: Response = await client.get(
+            f"/parts/{part_id}", params={"fields": fields}
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()["data"]) == expected_keys
+        assert response.json()["data"]["id"] == str(part_id)
+
+    @pytest.mark.anyio
+    async def test_get_single_part_unknown_fields(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.get(
+            f"/parts/{parts.inserted_ids[0]}", params={"fields": "name,password"}
+        )
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["message"] == "Unknown fields password"
+
     @pytest.mark.parametrize(
         "invalid_id", [0, 123, 2.5, " ", "asd", "null", None, [], {}, ()]
     )
@@ -67,6 +113,68 @@ class TestPartsNoAuth:
         assert response.status_code == status.HTTP_200_OK
         assert total_parts == len(response.json()["data"])
 
+    @pytest.mark.anyio
+    async def test_get_parts_paginated(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        params: Dict[str, Any] = {"limit": 2}
+        seen_ids: List[str] = []
+        pages: int = 0
+        # Act
+        while True:
+            response: Response = await client.get("/search/parts", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            seen_ids.extend(part["id"] for part in response.json()["data"])
+            pages += 1
+            if response.json()["next_cursor"] is None:
+                break
+            params["cursor"] = response.json()["next_cursor"]
+        # Assert
+        assert pages == 3
+        assert seen_ids == [str(part_id) for part_id in parts.inserted_ids]
+
+    @pytest.mark.parametrize(
+        "params, headers",
+        [
+            ({"stream": True}, {}),
+            ({}, {"accept": "application/x-ndjson"}),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_stream_all_parts(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        params: Dict[str, Any],
+        headers: Dict[str, str],
+    ):
+        # Act
+        response: Response = await client.get(
+            "/search/parts", params=params, headers=headers
+        )
+        rows: List[Dict[str, Any]] = [
+            json.loads(line) for line in response.text.splitlines()
+        ]
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [row["id"] for row in rows] == [
+            str(part_id) for part_id in parts.inserted_ids
+        ]
+
+    @pytest.mark.parametrize("cursor", ["asd", "bnVsbA", "WyJhc2QiXQ"])
+    @pytest.mark.anyio
+    async def test_get_parts_invalid_cursor(
+        self, client: AsyncClient, parts: InsertManyResult, cursor: str
+    ):
+        # Act
+        response: Response = await client.get(
+            "/search/parts", params={"cursor": cursor}
+        )
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     @pytest.mark.parametrize(
         "data",
         [
@@ -179,6 +287,470 @@ class TestPartsNoAuth:
         # Assert
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    @pytest.mark.anyio
+    async def test_create_parts_bulk(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        new_parts: List[Dict[str, Any]] = [
+            {
+                "serial_number": f"BULK{index}",
+                "name": "Bolt",
+                "description": "M6",
+                "category": "SubTools",
+                "quantity": index,
+                "price": 0.1,
+                "location": {"room": "A1"},
+            }
+            for index in range(50)
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk", content=json.dumps(new_parts)
+        )
+        sub_tools: Category = await Category.find_one({"name": "SubTools"})
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["message"] == "50 of 50 parts created"
+        assert await Part.find({"name": "Bolt"}).count() == 50
+        assert sub_tools.part_count == 52
+
+    @pytest.mark.anyio
+    async def test_create_parts_bulk_partial_failure(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        valid_part: Dict[str, Any] = {
+            "serial_number": "BULK1",
+            "name": "Bolt",
+            "description": "M6",
+            "category": "SubTools",
+            "quantity": 1,
+            "price": 0.1,
+            "location": {},
+        }
+        new_parts: List[Dict[str, Any]] = [
+            valid_part,
+            {**valid_part, "serial_number": "existing_serial"},
+            {**valid_part, "serial_number": "BULK2", "category": "Tools"},
+            {**valid_part, "serial_number": "BULK3", "category": "Missing"},
+            {**valid_part, "serial_number": "BULK4", "quantity": "many"},
+            valid_part,
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk", content=json.dumps(new_parts)
+        )
+        results: List[Dict[str, Any]] = response.json()["data"]
+        # Assert
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert [result["status"] for result in results] == [
+            "created",
+            "error",
+            "error",
+            "error",
+            "error",
+            "error",
+        ]
+        assert "existing_serial" in results[1]["detail"]
+        assert results[2]["detail"] == 'Could not assign part to base category "Tools"'
+        assert "do not exist" in results[3]["detail"]
+        assert results[4]["detail"][0]["loc"] == ["quantity"]
+        assert "BULK1" in results[5]["detail"]
+        assert await Part.find({"name": "Bolt"}).count() == 1
+
+    @pytest.mark.anyio
+    async def test_import_parts_csv(
+        self, client: AsyncClient, parts: InsertManyResult, monkeypatch
+    ):
+        # Arrange
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+        monkeypatch.setattr(settings, "IMPORT_MAX_IN_FLIGHT", 2)
+        rows: List[str] = [
+            "serial_number,name,description,category,quantity,price,room,location.shelf",
+            "IMP1,Nut,M6,SubTools,10,0.05,A1,3",
+            "IMP2,Nut,M8,SubTools,many,0.05,A1,",
+            "IMP3,Nut,M10,Tools,5,0.05,,",
+            "IMP4,Nut,M12,SubTools,5,0.05,,",
+            "existing_serial,Nut,M6,SubTools,1,0.05,,",
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/import",
+            files={"file": ("feed.csv", "\n".join(rows), "text/csv")},
+        )
+        events: List[Dict[str, Any]] = [
+            json.loads(line) for line in response.text.splitlines()
+        ]
+        imported: Part = await Part.find_one({"serial_number": "IMP1"})
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(event["row"] for event in events if event["type"] == "error") == [
+            3,
+            4,
+            6,
+        ]
+        assert [event["processed"] for event in events if event["type"] == "progress"]
+        assert events[-1] == {
+            "type": "summary",
+            "processed": 5,
+            "created": 2,
+            "failed": 3,
+            "aborted": False,
+        }
+        assert imported.quantity == 10
+        assert imported.location.room == "A1"
+        assert imported.location.shelf == "3"
+
+    @pytest.mark.anyio
+    async def test_import_parts_jsonl(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        rows: List[str] = [
+            json.dumps(
+                {
+                    "serial_number": "IMP1",
+                    "name": "Nut",
+                    "description": "M6",
+                    "category": "SubTools",
+                    "quantity": 1,
+                    "price": 0.05,
+                    "location": {"room": "A1"},
+                }
+            ),
+            "",
+            "{not json",
+            "[]",
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/import",
+            files={"file": ("feed.jsonl", "\n".join(rows), "application/x-ndjson")},
+        )
+        events: List[Dict[str, Any]] = [
+            json.loads(line) for line in response.text.splitlines()
+        ]
+        # Assert
+        assert [event["row"] for event in events if event["type"] == "error"] == [3, 4]
+        assert events[-1]["created"] == 1
+        assert await Part.find({"serial_number": "IMP1"}).count() == 1
+
+    @pytest.mark.anyio
+    async def test_import_parts_aborted(
+        self, client: AsyncClient, parts: InsertManyResult, monkeypatch
+    ):
+        # Arrange
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 1)
+        monkeypatch.setattr(settings, "IMPORT_MAX_IN_FLIGHT", 2)
+        cancelled: List[str] = []
+
+        async def failing_insert_parts(rows: List[Dict[str, Any]]):
+            if rows[0]["serial_number"] == "FAIL":
+                raise ServerSelectionTimeoutError("No servers available")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(rows[0]["serial_number"])
+                raise
+
+        monkeypatch.setattr(importer, "insert_parts", failing_insert_parts)
+        rows: List[str] = [
+            json.dumps({"serial_number": serial_number})
+            for serial_number in ("SLOW", "FAIL", "NEVER")
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/import",
+            files={"file": ("feed.jsonl", "\n".join(rows), "application/x-ndjson")},
+        )
+        events: List[Dict[str, Any]] = [
+            json.loads(line) for line in response.text.splitlines()
+        ]
+        # Assert
+        assert events[0]["type"] == "error"
+        assert events[0]["row"] is None
+        assert "No servers available" in events[0]["detail"]
+        assert events[-1] == {
+            "type": "summary",
+            "processed": 0,
+            "created": 0,
+            "failed": 0,
+            "aborted": True,
+        }
+        assert cancelled == ["SLOW"]
+
+    @pytest.mark.anyio
+    async def test_import_parts_unsupported_file(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.post(
+            "/parts/import", files={"file": ("feed.xlsx", b"", "application/zip")}
+        )
+        # Assert
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    @pytest.mark.anyio
+    async def test_export_parts_csv(self, client: AsyncClient, parts: InsertManyResult):
+        # Act
+        response: Response = await client.get(
+            "/parts/export", params={"category": "SubTools", "room": "A101"}
+        )
+        rows: List[Dict[str, str]] = list(csv.DictReader(io.StringIO(response.text)))
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert len(rows) == 1
+        assert rows[0]["serial_number"] == "ABC123"
+        assert rows[0]["location.room"] == "A101"
+        assert rows[0]["location.cubicle"] == ""
+        assert "revision_id" not in rows[0]
+
+    @pytest.mark.anyio
+    async def test_export_parts_jsonl_gzip(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.get(
+            "/parts/export", params={"format": "jsonl", "gzip": True}
+        )
+        rows: List[Dict[str, Any]] = [
+            json.loads(line)
+            for line in gzip.decompress(response.content).decode().splitlines()
+        ]
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/gzip"
+        assert "parts.jsonl.gz" in response.headers["content-disposition"]
+        assert [row["id"] for row in rows] == [str(id) for id in parts.inserted_ids]
+        assert rows[0]["location"]["room"] == "A101"
+
+    @pytest.mark.parametrize(
+        "delta, expected_status_code, expected_quantity",
+        [
+            (-4, status.HTTP_200_OK, 6),
+            (-10, status.HTTP_200_OK, 0),
+            (3, status.HTTP_200_OK, 13),
+            (-11, status.HTTP_409_CONFLICT, 10),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_adjust_part_stock(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        delta: int,
+        expected_status_code: status,
+        expected_quantity: int,
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        # Act
+        response: Response = await client.post(
+            f"/parts/{part_id}/adjust", content=json.dumps({"delta": delta})
+        )
+        part: Part = await Part.get(part_id)
+        # Assert
+        assert response.status_code == expected_status_code
+        assert part.quantity == expected_quantity
+        if expected_status_code == status.HTTP_200_OK:
+            assert response.json()["data"]["quantity"] == expected_quantity
+
+    @pytest.mark.anyio
+    async def test_adjust_part_stock_do_not_exist(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.post(
+            f"/parts/{PydanticObjectId()}/adjust", content=json.dumps({"delta": 1})
+        )
+        # Assert
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.anyio
+    async def test_adjust_stock_bulk(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        adjustments: List[Dict[str, Any]] = [
+            {"serial_number": "ABC123", "delta": -1},
+            {"serial_number": "ABC123", "delta": -2},
+            {"serial_number": "DEF456", "delta": -6},
+            {"serial_number": "MISSING", "delta": 1},
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/adjust", content=json.dumps(adjustments)
+        )
+        results: List[Dict[str, Any]] = response.json()["data"]
+        # Assert
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert [result["status"] for result in results] == [
+            "adjusted",
+            "adjusted",
+            "error",
+            "error",
+        ]
+        assert results[2]["detail"] == "Insufficient stock"
+        assert results[3]["detail"] == "Part not found"
+        assert (await Part.find_one({"serial_number": "ABC123"})).quantity == 7
+        assert (await Part.find_one({"serial_number": "DEF456"})).quantity == 5
+
+    @pytest.mark.anyio
+    async def test_adjust_stock_bulk_bounded(
+        self, client: AsyncClient, parts: InsertManyResult, monkeypatch
+    ):
+        # Arrange
+        monkeypatch.setattr(settings, "BULK_ADJUST_MAX_IN_FLIGHT", 2)
+        in_flight: List[int] = [0, 0]
+        increment_quantity = stock._increment_quantity
+
+        async def tracked_increment_quantity(query: Dict[str, Any], delta: int):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+            await asyncio.sleep(0.001)
+            try:
+                return await increment_quantity(query, delta)
+            finally:
+                in_flight[0] -= 1
+
+        monkeypatch.setattr(stock, "_increment_quantity", tracked_increment_quantity)
+        adjustments: List[Dict[str, Any]] = [
+            {"serial_number": "ABC123", "delta": 1} for _ in range(10)
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/adjust", content=json.dumps(adjustments)
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert in_flight == [0, 2]
+        assert (await Part.find_one({"serial_number": "ABC123"})).quantity == 20
+
+    @pytest.mark.parametrize("batch_size", [1, 1000])
+    @pytest.mark.anyio
+    async def test_update_parts_bulk(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        batch_size: int,
+        monkeypatch,
+    ):
+        # Arrange
+        monkeypatch.setattr(settings, "BULK_WRITE_BATCH_SIZE", batch_size)
+        data: Dict[str, Any] = {
+            "filter": {"category": "SubTools"},
+            "update": {"category": "SubTools2", "location": {"room": "Z9"}},
+        }
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk/update", content=json.dumps(data)
+        )
+        moved_parts: List[Part] = await Part.find({"category": "SubTools2"}).to_list()
+        sub_tools: Category = await Category.find_one({"name": "SubTools"})
+        sub_tools_2: Category = await Category.find_one({"name": "SubTools2"})
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == {"matched": 2, "modified": 2}
+        assert {part.location.room for part in moved_parts} == {"Z9", None}
+        assert moved_parts[0].location.bookcase == "B2"
+        assert sub_tools.part_count == 0
+        assert sub_tools_2.part_count == 3
+
+    @pytest.mark.parametrize(
+        "update, expected_update",
+        [
+            ({"price_change_percent": 10}, {"$mul": {"price": 1.1}}),
+            (
+                {"price": 2, "location": {"room": "Z9", "shelf": 3}},
+                {"$set": {"price": 2, "location.room": "Z9", "location.shelf": 3}},
+            ),
+            ({"location": {}}, {}),
+        ],
+    )
+    def test_bulk_part_update_to_update(
+        self, update: Dict[str, Any], expected_update: Dict[str, Any]
+    ):
+        # Act
+        result: Dict[str, Any] = BulkPartUpdate(**update).to_update()
+        # Assert
+        assert result == expected_update
+
+    @pytest.mark.parametrize(
+        "data, expected_status_code",
+        [
+            ({"filter": {}, "update": {"price": 1}}, status.HTTP_400_BAD_REQUEST),
+            ({"filter": {"room": "A1"}, "update": {}}, status.HTTP_400_BAD_REQUEST),
+            (
+                {
+                    "filter": {"room": "A1"},
+                    "update": {"price": 1, "price_change_percent": 5},
+                },
+                status.HTTP_400_BAD_REQUEST,
+            ),
+            (
+                {"filter": {"room": "A1"}, "update": {"category": "Tools"}},
+                status.HTTP_409_CONFLICT,
+            ),
+            (
+                {"filter": {"room": "A1"}, "update": {"price_change_percent": -100}},
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+            ),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_update_parts_bulk_invalid_data(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        data: Dict[str, Any],
+        expected_status_code: int,
+    ):
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk/update", content=json.dumps(data)
+        )
+        # Assert
+        assert response.status_code == expected_status_code
+
+    @pytest.mark.parametrize("batch_size", [1, 1000])
+    @pytest.mark.anyio
+    async def test_delete_parts_bulk(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        batch_size: int,
+        monkeypatch,
+    ):
+        # Arrange
+        monkeypatch.setattr(settings, "BULK_WRITE_BATCH_SIZE", batch_size)
+        data: Dict[str, Any] = {
+            "filter": {"serial_numbers": ["ABC123", "GHI789", "missing"]}
+        }
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk/delete", content=json.dumps(data)
+        )
+        sub_tools: Category = await Category.find_one({"name": "SubTools"})
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == {"deleted": 2}
+        assert await Part.count() == len(parts.inserted_ids) - 2
+        assert sub_tools.part_count == 1
+
+    @pytest.mark.anyio
+    async def test_delete_parts_bulk_requires_filter(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk/delete", content=json.dumps({"filter": {}})
+        )
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert await Part.count() == len(parts.inserted_ids)
+
     @pytest.mark.parametrize(
         "update_data",
         [
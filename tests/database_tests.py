@@ -0,0 +1,261 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import status
+from httpx import AsyncClient, Response
+from pymongo.results import InsertManyResult
+
+from src.core.bookkeeping import record_write
+from src.core.cache.category_tree import category_tree
+from src.core.database import uses_collection_scan
+from src.core.models.category import Category
+from src.core.models.collection_version import CollectionVersion
+from src.core.models.part import Part
+
+from .conftest import mock_no_authentication
+
+
+@pytest.mark.parametrize(
+    "plan, expected",
+    [
+        ({"stage": "COLLSCAN", "filter": {"category": {"$eq": ""}}}, True),
+        ({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}, False),
+        ({"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}, True),
+        ({"queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}, False),
+        (
+            {
+                "stage": "OR",
+                "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}],
+            },
+            True,
+        ),
+        ({"stage": "IDHACK"}, False),
+    ],
+)
+def test_uses_collection_scan(plan: Dict[str, Any], expected: bool):
+    # Act
+    result: bool = uses_collection_scan(plan)
+    # Assert
+    assert result is expected
+
+
+class CommandCounter:
+    commands: Tuple[str, ...] = (
+        "aggregate",
+        "bulk_write",
+        "count_documents",
+        "delete_many",
+        "delete_one",
+        "find",
+        "find_one",
+        "find_one_and_delete",
+        "find_one_and_update",
+        "insert_many",
+        "insert_one",
+        "replace_one",
+        "update_many",
+        "update_one",
+    )
+
+    def __init__(self, collection: Any, counter: Counter):
+        self.collection: Any = collection
+        self.counter: Counter = counter
+
+    def __getattr__(self, name: str) -> Any:
+        attribute: Any = getattr(self.collection, name)
+        if name not in self.commands:
+            return attribute
+
+        def counted(*args, **kwargs) -> Any:
+            self.counter[self.collection.name] += 1
+            return attribute(*args, **kwargs)
+
+        return counted
+
+
+@pytest.fixture
+def commands(monkeypatch) -> Counter:
+    counter: Counter = Counter()
+    for document in (Part, Category, CollectionVersion):
+        document_settings: Any = document.get_settings()
+        monkeypatch.setattr(
+            document_settings,
+            "motor_collection",
+            CommandCounter(document_settings.motor_collection, counter),
+        )
+    return counter
+
+
+class TestRoundTripsNoAuth:
+    @classmethod
+    def setup_class(cls):
+        mock_no_authentication()
+
+    @pytest.mark.anyio
+    async def test_create_part_round_trips(
+        self, client: AsyncClient, parts: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        part_data: Dict[str, Any] = {
+            "serial_number": "TRIP1",
+            "name": "Bolt",
+            "description": "M6",
+            "category": "SubTools",
+            "quantity": 1,
+            "price": 0.1,
+            "location": {"room": "A1"},
+        }
+        await client.post(
+            "/parts", content=json.dumps({**part_data, "serial_number": "WARM"})
+        )
+        commands.clear()
+        # Act
+        response: Response = await client.post("/parts", content=json.dumps(part_data))
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["data"]["serial_number"] == "TRIP1"
+        assert commands == {"parts": 1, "categories": 1, "collection_versions": 1}
+
+    @pytest.mark.parametrize(
+        "update_data, expected_commands",
+        [
+            (
+                {"quantity": 3, "location": {"shelf": 4}},
+                {"parts": 1, "collection_versions": 1},
+            ),
+            (
+                {"category": "SubTools2"},
+                {"parts": 1, "categories": 1, "collection_versions": 1},
+            ),
+            ({"location": {}}, {"parts": 1}),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_update_part_round_trips(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        commands: Counter,
+        update_data: Dict[str, Any],
+        expected_commands: Dict[str, int],
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        await category_tree.get_many({"SubTools", "SubTools2"})
+        await client.put(f"/parts/{part_id}", content=json.dumps({"quantity": 1}))
+        commands.clear()
+        # Act
+        response: Response = await client.put(
+            f"/parts/{part_id}", content=json.dumps(update_data)
+        )
+        data: Dict[str, Any] = response.json()["data"]
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert commands == expected_commands
+        assert data == (await Part.get(part_id)).model_dump()
+
+    @pytest.mark.anyio
+    async def test_update_category_round_trips(
+        self, client: AsyncClient, categories: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        category: Category = await Category.find_one({"name": "Miscellaneous"})
+        commands.clear()
+        # Act
+        response: Response = await client.put(
+            f"/categories/{category.id}", content=json.dumps({"name": "Other"})
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["name"] == "Other"
+        assert commands == {"categories": 1, "collection_versions": 1}
+
+    @pytest.mark.anyio
+    async def test_create_category_round_trips(
+        self, client: AsyncClient, categories: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        await category_tree.get_many({"Tools"})
+        commands.clear()
+        # Act
+        response: Response = await client.post(
+            "/categories",
+            content=json.dumps({"name": "Clamps", "parent_name": "Tools"}),
+        )
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert commands == {"categories": 2, "collection_versions": 1}
+
+    @pytest.mark.anyio
+    async def test_delete_part_round_trips(
+        self, client: AsyncClient, parts: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        commands.clear()
+        # Act
+        response: Response = await client.delete(f"/parts/{part_id}")
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert commands == {"parts": 1, "categories": 1, "collection_versions": 1}
+
+    @pytest.mark.anyio
+    async def test_adjust_stock_round_trips(
+        self, client: AsyncClient, parts: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        commands.clear()
+        # Act
+        response: Response = await client.post(
+            f"/parts/{part_id}/adjust", content=json.dumps({"delta": -1})
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert commands == {"parts": 1, "collection_versions": 1}
+
+    @pytest.mark.anyio
+    async def test_record_write_round_trips(
+        self, client: AsyncClient, categories: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        before: Dict[str, int] = await CollectionVersion.get_versions(
+            "parts", "categories"
+        )
+        commands.clear()
+        # Act
+        await record_write(["parts"], {"part_count": {"SubTools": 0, None: 1}})
+        unchanged: Counter = commands.copy()
+        await record_write(["parts"], {"part_count": {"SubTools": 2}})
+        after: Dict[str, int] = await CollectionVersion.get_versions(
+            "parts", "categories"
+        )
+        sub_tools: Category = await Category.find_one({"name": "SubTools"})
+        # Assert
+        assert unchanged == {"collection_versions": 1}
+        assert after == {
+            "parts": before["parts"] + 2,
+            "categories": before["categories"] + 1,
+        }
+        assert sub_tools.part_count == 2
+
+    @pytest.mark.anyio
+    async def test_adjust_stock_bulk_round_trips(
+        self, client: AsyncClient, parts: InsertManyResult, commands: Counter
+    ):
+        # Arrange
+        adjustments: List[Dict[str, Any]] = [
+            {"serial_number": serial_number, "delta": -1}
+            for serial_number in ("ABC123", "DEF456", "GHI789", "MISSING")
+        ]
+        commands.clear()
+        # Act
+        response: Response = await client.post(
+            "/parts/adjust", content=json.dumps(adjustments)
+        )
+        # Assert
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert commands == {"parts": 5, "collection_versions": 1}
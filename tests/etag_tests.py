@@ -0,0 +1,121 @@
+import json
+from typing import Optional
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import status
+from httpx import AsyncClient, Response
+from pymongo.results import InsertManyResult
+
+from src.core.etag import etag_matches
+
+from .conftest import mock_no_authentication
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('"xyz"', False),
+        ('"xyz", "abc"', True),
+        ('W/"abc"', True),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match: Optional[str], expected: bool):
+    # Act
+    result: bool = etag_matches(if_none_match, '"abc"')
+    # Assert
+    assert result is expected
+
+
+class TestETagNoAuth:
+    @classmethod
+    def setup_class(cls):
+        mock_no_authentication()
+
+    @pytest.mark.anyio
+    async def test_get_part_not_modified(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        first: Response = await client.get(f"/parts/{part_id}")
+        etag: str = first.headers["etag"]
+        # Act
+        cached: Response = await client.get(
+            f"/parts/{part_id}", headers={"If-None-Match": etag}
+        )
+        projected: Response = await client.get(
+            f"/parts/{part_id}",
+            params={"fields": "name"},
+            headers={"If-None-Match": etag},
+        )
+        await client.post(f"/parts/{part_id}/adjust", content=json.dumps({"delta": 1}))
+        changed: Response = await client.get(
+            f"/parts/{part_id}", headers={"If-None-Match": etag}
+        )
+        # Assert
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+        assert projected.status_code == status.HTTP_200_OK
+        assert changed.status_code == status.HTTP_200_OK
+        assert changed.headers["etag"] != etag
+
+    @pytest.mark.anyio
+    async def test_get_category_not_modified(
+        self, client: AsyncClient, categories: InsertManyResult
+    ):
+        # Arrange
+        category_id: PydanticObjectId = categories.inserted_ids[0]
+        etag: str = (await client.get(f"/categories/{category_id}")).headers["etag"]
+        # Act
+        response: Response = await client.get(
+            f"/categories/{category_id}", headers={"If-None-Match": etag}
+        )
+        # Assert
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.anyio
+    async def test_list_parts_not_modified_until_write(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        etag: str = (await client.get("/search/parts")).headers["etag"]
+        # Act
+        cached: Response = await client.get(
+            "/search/parts", headers={"If-None-Match": etag}
+        )
+        other_page: Response = await client.get(
+            "/search/parts", params={"limit": 1}, headers={"If-None-Match": etag}
+        )
+        await client.put(
+            f"/parts/{parts.inserted_ids[0]}", content=json.dumps({"quantity": 1})
+        )
+        changed: Response = await client.get(
+            "/search/parts", headers={"If-None-Match": etag}
+        )
+        # Assert
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert other_page.status_code == status.HTTP_200_OK
+        assert changed.status_code == status.HTTP_200_OK
+
+    @pytest.mark.anyio
+    async def test_list_categories_changes_with_part_counters(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        etag: str = (await client.get("/search/categories")).headers["etag"]
+        # Act
+        cached: Response = await client.get(
+            "/search/categories", headers={"If-None-Match": etag}
+        )
+        await client.delete(f"/parts/{parts.inserted_ids[0]}")
+        changed: Response = await client.get(
+            "/search/categories", headers={"If-None-Match": etag}
+        )
+        # Assert
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert changed.status_code == status.HTTP_200_OK
@@ -0,0 +1,156 @@
+from typing import Any, Dict, List, Optional
+
+import msgpack
+import pytest
+from beanie import PydanticObjectId
+from fastapi import status
+from httpx import AsyncClient, Response
+from pymongo.results import InsertManyResult
+
+from src.core.models.part import Part
+from src.core.negotiation import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiate_media_type,
+)
+from src.core.streaming import wants_ndjson
+
+from .conftest import mock_no_authentication
+
+MSGPACK_HEADERS: Dict[str, str] = {"Accept": MSGPACK_MEDIA_TYPE}
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("application/json", JSON_MEDIA_TYPE),
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/json;q=0.5, application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0, application/json", JSON_MEDIA_TYPE),
+        ("application/json, application/msgpack;q=0.1", JSON_MEDIA_TYPE),
+        ("application/msgpack, */*", MSGPACK_MEDIA_TYPE),
+        ("*/*, application/msgpack;q=0.5", JSON_MEDIA_TYPE),
+        ("text/html", JSON_MEDIA_TYPE),
+        ("application/msgpack;q=0", JSON_MEDIA_TYPE),
+    ],
+)
+def test_negotiate_media_type(accept: Optional[str], expected: str):
+    # Act
+    result: str = negotiate_media_type(accept)
+    # Assert
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "accept, stream, expected",
+    [
+        (None, False, False),
+        (None, True, True),
+        ("application/x-ndjson", False, True),
+        ("application/x-ndjson, */*", False, True),
+        ("*/*, application/x-ndjson", False, True),
+        ("application/json, application/x-ndjson;q=0", False, False),
+        ("application/x-ndjson;q=0", False, False),
+        ("application/x-ndjson;q=0.5, application/json", False, False),
+        ("application/json;q=0.5, application/x-ndjson", False, True),
+        ("application/json, application/x-ndjson;q=0", True, True),
+    ],
+)
+def test_wants_ndjson(accept: Optional[str], stream: bool, expected: bool):
+    # Act
+    result: bool = wants_ndjson(accept, stream)
+    # Assert
+    assert result == expected
+
+
+class TestNegotiationNoAuth:
+    @classmethod
+    def setup_class(cls):
+        mock_no_authentication()
+
+    @pytest.mark.anyio
+    async def test_get_part_msgpack(self, client: AsyncClient, parts: InsertManyResult):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        json_response: Response = await client.get(f"/parts/{part_id}")
+        # Act
+        response: Response = await client.get(
+            f"/parts/{part_id}", headers=MSGPACK_HEADERS
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert "Accept" in response.headers["vary"]
+        assert msgpack.unpackb(response.content) == json_response.json()
+        assert response.headers["etag"] != json_response.headers["etag"]
+
+    @pytest.mark.anyio
+    async def test_search_parts_msgpack(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        json_response: Response = await client.get("/search/parts")
+        # Act
+        response: Response = await client.get("/search/parts", headers=MSGPACK_HEADERS)
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert msgpack.unpackb(response.content) == json_response.json()
+
+    @pytest.mark.anyio
+    async def test_get_categories_msgpack(
+        self, client: AsyncClient, categories: InsertManyResult
+    ):
+        # Arrange
+        category_id: PydanticObjectId = categories.inserted_ids[0]
+        json_response: Response = await client.get(f"/categories/{category_id}")
+        # Act
+        response: Response = await client.get(
+            f"/categories/{category_id}", headers=MSGPACK_HEADERS
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert msgpack.unpackb(response.content) == json_response.json()
+
+    @pytest.mark.anyio
+    async def test_create_parts_bulk_msgpack(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        new_parts: List[Dict[str, Any]] = [
+            {
+                "serial_number": f"PACK{i}",
+                "name": "Washer",
+                "description": "M6",
+                "category": "SubTools",
+                "quantity": 10,
+                "price": 0.05,
+                "location": {},
+            }
+            for i in range(3)
+        ]
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk",
+            content=msgpack.packb(new_parts),
+            headers={**MSGPACK_HEADERS, "Content-Type": MSGPACK_MEDIA_TYPE},
+        )
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert msgpack.unpackb(response.content)["message"] == "3 of 3 parts created"
+        assert await Part.find({"name": "Washer"}).count() == 3
+
+    @pytest.mark.anyio
+    async def test_create_parts_bulk_invalid_msgpack(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.post(
+            "/parts/bulk",
+            content=b"\xc1",
+            headers={"Content-Type": MSGPACK_MEDIA_TYPE},
+        )
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient, Response
+from pymongo.results import InsertManyResult
+
+from .conftest import mock_no_authentication
+
+
+class TestReportNoAuth:
+    @classmethod
+    def setup_class(cls):
+        mock_no_authentication()
+
+    @pytest.mark.anyio
+    async def test_valuation_rolls_up_categories(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Act
+        response: Response = await client.get("/reports/valuation")
+        rows: Dict[str, Dict[str, Any]] = {
+            row["category"]: row for row in response.json()["data"]
+        }
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert rows["SubTools"]["total_value"] == 109.85
+        assert rows["SubTools"]["part_count"] == 2
+        assert rows["Tools"]["total_value"] == 0
+        assert rows["Tools"]["rollup_total_value"] == 120.32
+        assert rows["Tools"]["rollup_total_quantity"] == 18
+        assert rows["Tools"]["rollup_part_count"] == 3
+        assert rows["Miscellaneous"]["rollup_total_value"] == 0
+        assert response.json()["total"] == {
+            "part_count": 5,
+            "total_quantity": 21,
+            "total_value": 236.29,
+        }
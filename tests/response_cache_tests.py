@@ -0,0 +1,88 @@
+import json
+from typing import Any, Dict
+
+import pytest
+from beanie import PydanticObjectId
+from httpx import AsyncClient, Response
+from pymongo.results import InsertManyResult
+
+from src.core.cache.response_cache import MemoryResponseCacheBackend
+from src.core.models.category import Category
+from src.core.models.part import Part
+
+from .conftest import mock_no_authentication
+
+
+@pytest.mark.anyio
+async def test_memory_backend():
+    # Arrange
+    backend: MemoryResponseCacheBackend = MemoryResponseCacheBackend(maxsize=10, ttl=60)
+    await backend.set("parts", "1", (b"one", '"1"'))
+    await backend.set("parts", "2", (b"two", '"2"'))
+    await backend.set("categories", "1", (b"three", '"3"'))
+    # Act
+    await backend.delete("parts", ["1"])
+    await backend.clear("categories")
+    # Assert
+    assert await backend.get("parts", "1") is None
+    assert await backend.get("parts", "2") == (b"two", '"2"')
+    assert await backend.get("categories", "1") is None
+    assert backend.stats()["parts"]["hits"] == 1
+
+
+class TestResponseCacheNoAuth:
+    @classmethod
+    def setup_class(cls):
+        mock_no_authentication()
+
+    @pytest.mark.anyio
+    async def test_get_part_served_from_cache_until_write(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        await client.get(f"/parts/{part_id}")
+        await Part.get_motor_collection().update_one(
+            {"_id": part_id}, {"$set": {"name": "Changed behind the cache"}}
+        )
+        # Act
+        cached: Response = await client.get(f"/parts/{part_id}")
+        await client.put(f"/parts/{part_id}", content=json.dumps({"quantity": 1}))
+        fresh: Response = await client.get(f"/parts/{part_id}")
+        metrics: Dict[str, Any] = (await client.get("/metrics")).json()
+        # Assert
+        assert cached.json()["data"]["name"] == "Widget"
+        assert fresh.json()["data"]["name"] == "Changed behind the cache"
+        assert fresh.json()["data"]["quantity"] == 1
+        assert metrics["response_cache"]["parts"]["hits"] >= 1
+
+    @pytest.mark.anyio
+    async def test_get_category_invalidated_by_part_counters(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        sub_tools: Category = await Category.find_one({"name": "SubTools"})
+        before: Response = await client.get(f"/categories/{sub_tools.id}")
+        # Act
+        await client.delete(f"/parts/{parts.inserted_ids[0]}")
+        after: Response = await client.get(f"/categories/{sub_tools.id}")
+        # Assert
+        assert after.json()["data"]["part_count"] == (
+            before.json()["data"]["part_count"] - 1
+        )
+
+    @pytest.mark.anyio
+    async def test_get_part_stock_adjustment_invalidates(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        await client.get(f"/parts/{part_id}")
+        # Act
+        await client.post(
+            "/parts/adjust",
+            content=json.dumps([{"serial_number": "ABC123", "delta": -2}]),
+        )
+        response: Response = await client.get(f"/parts/{part_id}")
+        # Assert
+        assert response.json()["data"]["quantity"] == 8
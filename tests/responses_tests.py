@@ -0,0 +1,46 @@
+from typing import Any, Dict, List
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+from pymongo.results import InsertManyResult
+
+from src.core.models.category import Category
+from src.core.models.part import Part
+from src.core.responses import ModelResponse
+
+
+@pytest.mark.anyio
+async def test_model_response_matches_json_response(
+    client: AsyncClient, parts: InsertManyResult
+):
+    # Arrange
+    part_list: List[Part] = await Part.find_all().to_list()
+    category: Category = await Category.find_one({"name": "SubTools"})
+    content: Dict[str, Any] = {
+        "data": part_list,
+        "category": category,
+        "ids": [str(part.id) for part in part_list],
+        "next_cursor": None,
+    }
+    # Act
+    response: ModelResponse = ModelResponse(content)
+    expected: JSONResponse = JSONResponse(
+        {
+            **content,
+            "data": [part.model_dump() for part in part_list],
+            "category": category.model_dump(),
+        }
+    )
+    # Assert
+    assert response.body == expected.body
+
+
+def test_model_response_falls_back_for_unknown_types():
+    # Arrange
+    object_id: PydanticObjectId = PydanticObjectId()
+    # Act
+    response: ModelResponse = ModelResponse({"id": object_id})
+    # Assert
+    assert response.body == f'{{"id":"{object_id}"}}'.encode()
@@ -0,0 +1,327 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import status
+from httpx import AsyncClient, Response
+from pymongo.results import InsertManyResult
+
+from src.core.cache.serial_index import SerialNumberIndex, serial_index
+from src.core.models.part import Part
+from src.core.pagination import encode_cursor
+from src.core.projection import parse_fields
+from src.core.routes.search_routes import _text_search_pipeline
+
+from .conftest import mock_no_authentication
+
+# Relevance the stubbed text index gives each serial number
+TEXT_SCORES: Dict[str, float] = {
+    "ABC123": 2.0,
+    "DEF456": 1.0,
+    "GHI789": 1.0,
+    "JKL012": 0.5,
+}
+
+
+@pytest.fixture
+async def text_index(parts: InsertManyResult, monkeypatch) -> List[Dict[str, Any]]:
+    # mongomock has no $text, so matches and scores are stored on the documents
+    # and the $text stages are swapped for plain ones before running the rest
+    for serial_number, score in TEXT_SCORES.items():
+        await Part.get_motor_collection().update_one(
+            {"serial_number": serial_number}, {"$set": {"text_score": score}}
+        )
+    pipelines: List[Dict[str, Any]] = []
+    aggregate = Part.aggregate
+
+    def text_aggregate(pipeline: List[Dict[str, Any]], *args, **kwargs):
+        pipelines.append(pipeline)
+        match: Dict[str, Any] = dict(pipeline[0]["$match"])
+        match.pop("$text")
+        return aggregate(
+            [
+                {"$match": {**match, "text_score": {"$exists": True}}},
+                {"$addFields": {"score": "$text_score"}},
+                *pipeline[2:],
+            ],
+            *args,
+            **kwargs,
+        )
+
+    monkeypatch.setattr(Part, "aggregate", text_aggregate)
+    yield pipelines
+
+
+def test_text_search_pipeline():
+    # Arrange
+    cursor: str = encode_cursor(1.5, PydanticObjectId("65f000000000000000000001"))
+    # Act
+    pipeline: List[Dict[str, Any]] = _text_search_pipeline(
+        "widget", {"category": "SubTools"}, 10, cursor, parse_fields(Part, "name")
+    )
+    # Assert
+    assert pipeline[0] == {
+        "$match": {"$text": {"$search": "widget"}, "category": "SubTools"}
+    }
+    assert pipeline[1] == {"$addFields": {"score": {"$meta": "textScore"}}}
+    assert pipeline[2]["$match"]["$or"][0] == {"score": {"$lt": 1.5}}
+    assert pipeline[2]["$match"]["$or"][1]["score"] == 1.5
+    assert pipeline[3:5] == [{"$sort": {"score": -1, "_id": 1}}, {"$limit": 11}]
+    assert pipeline[5]["$project"]["score"] == 1
+    assert pipeline[5]["$project"]["name"] == 1
+
+
+def test_serial_index_batch_updates():
+    # Arrange
+    index: SerialNumberIndex = SerialNumberIndex()
+    index.add_many(["B2", "A1", "C3"])
+    # Act
+    index.add_many(["B1", "A1", "D4", "B1"])
+    index.remove_many(["C3", "Z9"])
+    # Assert
+    assert index.complete("", 10) == ["A1", "B1", "B2", "D4"]
+
+
+class TestSearchNoAuth:
+    @classmethod
+    def setup_class(cls):
+        mock_no_authentication()
+
+    @pytest.mark.parametrize(
+        "params, expected_serial_numbers",
+        [
+            ({"category": "SubTools"}, ["ABC123", "DEF456"]),
+            (
+                {"min_price": 5, "max_price": 10},
+                ["ABC123", "DEF456", "existing_serial"],
+            ),
+            ({"category": "SubTools", "max_quantity": 5}, ["DEF456"]),
+            ({"min_quantity": 3, "max_price": 5}, ["GHI789"]),
+            ({"name": "Gi"}, ["DEF456"]),
+            ({"name": "."}, []),
+            ({"room": "101"}, ["JKL012"]),
+            ({"bookcase": "B2", "row": "1"}, ["ABC123"]),
+            ({"row": "2"}, ["existing_serial"]),
+            ({"category": "Tools"}, []),
+            ({"room": "-101"}, []),
+            ({"room": "--3"}, []),
+            ({"shelf": "²"}, []),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_filter_parts(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        params: Dict[str, Any],
+        expected_serial_numbers: List[str],
+    ):
+        # Act
+        response: Response = await client.get("/search/parts", params=params)
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            part["serial_number"] for part in response.json()["data"]
+        ] == expected_serial_numbers
+
+    @pytest.mark.anyio
+    async def test_filter_parts_paginated(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        params: Dict[str, Any] = {"category": "SubTools", "limit": 1}
+        # Act
+        first_page: Response = await client.get("/search/parts", params=params)
+        params["cursor"] = first_page.json()["next_cursor"]
+        last_page: Response = await client.get("/search/parts", params=params)
+        # Assert
+        assert first_page.json()["data"][0]["serial_number"] == "ABC123"
+        assert last_page.json()["data"][0]["serial_number"] == "DEF456"
+        assert last_page.json()["next_cursor"] is None
+
+    @pytest.mark.parametrize(
+        "url, params",
+        [
+            ("/search/parts", {"fields": "serial_number,quantity"}),
+            ("/search/parts", {"fields": "serial_number,quantity", "stream": True}),
+            ("/search/categories", {"fields": "parent_name"}),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_list_sparse_fields(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        url: str,
+        params: Dict[str, Any],
+    ):
+        # Arrange
+        expected_keys: set = {"id", *params["fields"].split(",")}
+        # Act
+        response: Response = await client.get(url, params=params)
+        rows: List[Dict[str, Any]] = (
+            [json.loads(line) for line in response.text.splitlines()]
+            if params.get("stream")
+            else response.json()["data"]
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert rows
+        assert all(set(row) == expected_keys for row in rows)
+
+    @pytest.mark.parametrize("params", [{"min_price": "cheap"}, {"max_quantity": 1.5}])
+    @pytest.mark.anyio
+    async def test_filter_parts_invalid_params(
+        self, client: AsyncClient, parts: InsertManyResult, params: Dict[str, Any]
+    ):
+        # Act
+        response: Response = await client.get("/search/parts", params=params)
+        # Assert
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.parametrize(
+        "params, expected_status_code",
+        [
+            ({}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+            ({"q": ""}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+            ({"q": "widget", "cursor": "WyJhc2QiXQ"}, status.HTTP_400_BAD_REQUEST),
+            ({"q": "widget", "cursor": "WzEuNV0"}, status.HTTP_400_BAD_REQUEST),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_text_search_invalid_params(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        params: Dict[str, Any],
+        expected_status_code: int,
+    ):
+        # Act
+        response: Response = await client.get("/search/parts/text", params=params)
+        # Assert
+        assert response.status_code == expected_status_code
+
+    @pytest.mark.anyio
+    async def test_text_search_paginated(
+        self, client: AsyncClient, text_index: List[Dict[str, Any]]
+    ):
+        # Arrange
+        params: Dict[str, Any] = {"q": "object", "limit": 2}
+        # Act
+        first_page: Response = await client.get("/search/parts/text", params=params)
+        params["cursor"] = first_page.json()["next_cursor"]
+        last_page: Response = await client.get("/search/parts/text", params=params)
+        # Assert
+        assert first_page.status_code == status.HTTP_200_OK
+        assert [
+            (part["serial_number"], part["score"]) for part in first_page.json()["data"]
+        ] == [("ABC123", 2.0), ("DEF456", 1.0)]
+        assert [
+            (part["serial_number"], part["score"]) for part in last_page.json()["data"]
+        ] == [("GHI789", 1.0), ("JKL012", 0.5)]
+        assert last_page.json()["next_cursor"] is None
+        assert text_index[0][0]["$match"]["$text"] == {"$search": "object"}
+
+    @pytest.mark.anyio
+    async def test_text_search_filtered_sparse_fields(
+        self, client: AsyncClient, text_index: List[Dict[str, Any]]
+    ):
+        # Arrange
+        params: Dict[str, Any] = {
+            "q": "object",
+            "category": "SubTools",
+            "fields": "name",
+        }
+        # Act
+        response: Response = await client.get("/search/parts/text", params=params)
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert [(part["name"], part["score"]) for part in response.json()["data"]] == [
+            ("Widget", 2.0),
+            ("Gizmo", 1.0),
+        ]
+        assert all(
+            set(part) == {"id", "name", "score"} for part in response.json()["data"]
+        )
+
+    @pytest.mark.parametrize(
+        "params, expected_serial_numbers",
+        [
+            ({"prefix": "A"}, ["ABC123"]),
+            ({"prefix": "e"}, ["existing_serial"]),
+            ({"prefix": "X"}, []),
+            ({"prefix": "ABC1234"}, []),
+        ],
+    )
+    @pytest.mark.anyio
+    async def test_autocomplete_serial_numbers(
+        self,
+        client: AsyncClient,
+        parts: InsertManyResult,
+        params: Dict[str, Any],
+        expected_serial_numbers: List[str],
+    ):
+        # Arrange
+        await serial_index.load()
+        # Act
+        response: Response = await client.get(
+            "/search/parts/autocomplete", params=params
+        )
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == expected_serial_numbers
+
+    @pytest.mark.anyio
+    async def test_autocomplete_follows_part_writes(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        await serial_index.load()
+        part_id: PydanticObjectId = parts.inserted_ids[0]
+        part_data: Dict[str, Any] = {
+            "serial_number": "ABC999",
+            "name": "Widget",
+            "description": "test-object",
+            "category": "SubTools",
+            "quantity": 1,
+            "price": 1.5,
+            "location": {},
+        }
+        # Act
+        await client.post("/parts", content=json.dumps(part_data))
+        await client.put(
+            f"/parts/{part_id}", content=json.dumps({"serial_number": "ABD123"})
+        )
+        await client.delete(f"/parts/{parts.inserted_ids[1]}")
+        response: Response = await client.get(
+            "/search/parts/autocomplete", params={"prefix": "AB", "limit": 5}
+        )
+        # Assert
+        assert response.json()["data"] == ["ABC999", "ABD123"]
+        assert len(serial_index) == len(parts.inserted_ids)
+
+    @pytest.mark.anyio
+    async def test_autocomplete_reloads_external_writes(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        await serial_index.load()
+        await Part.get_motor_collection().insert_one({"serial_number": "XYZ999"})
+        await Part.get_motor_collection().delete_one({"serial_number": "ABC123"})
+        # Act
+        reload: asyncio.Task = asyncio.create_task(
+            serial_index.reload_periodically(0.01)
+        )
+        await asyncio.sleep(0.05)
+        reload.cancel()
+        added: Response = await client.get(
+            "/search/parts/autocomplete", params={"prefix": "X"}
+        )
+        removed: Response = await client.get(
+            "/search/parts/autocomplete", params={"prefix": "A"}
+        )
+        # Assert
+        assert added.json()["data"] == ["XYZ999"]
+        assert removed.json()["data"] == []
@@ -1,5 +1,6 @@
+import asyncio
 import json
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import pytest
 from beanie.operators import Set
@@ -7,12 +8,40 @@ from fastapi import status
 from httpx import AsyncClient, Response
 from pymongo.results import InsertManyResult
 
+from src.core.cache.category_tree import CategoryNode, category_tree
 from src.core.models.category import Category
 from src.core.models.part import Part
 
 from .conftest import mock_no_authentication
 
 
+class SlowCollection:
+    # Yields to the event loop between documents, like a cursor over the network
+    def __init__(self, collection: Any):
+        self.collection: Any = collection
+        self.finds: int = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.collection, name)
+
+    def find(self, *args, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        self.finds += 1
+        return self._slow(self.collection.find(*args, **kwargs))
+
+    async def _slow(self, cursor: Any) -> AsyncIterator[Dict[str, Any]]:
+        async for document in cursor:
+            await asyncio.sleep(0)
+            yield document
+
+
+@pytest.fixture
+def slow_categories(monkeypatch) -> SlowCollection:
+    document_settings: Any = Category.get_settings()
+    collection: SlowCollection = SlowCollection(document_settings.motor_collection)
+    monkeypatch.setattr(document_settings, "motor_collection", collection)
+    return collection
+
+
 class TestValidationNoAuth:
     @classmethod
     def setup_class(cls):
@@ -157,3 +186,127 @@ class TestValidationNoAuth:
         # Assert
         assert response.status_code == status.HTTP_409_CONFLICT
         assert response.json()["detail"] == expected_response
+
+    @pytest.mark.anyio
+    async def test_create_part_validated_from_category_tree(
+        self, client: AsyncClient, categories: InsertManyResult, mocker
+    ):
+        # Arrange
+        await category_tree.load()
+        find_category = mocker.spy(Category.get_motor_collection(), "find_one")
+        part_data: Dict[str, Any] = {
+            "serial_number": "TEST123",
+            "name": "Doodad",
+            "description": "",
+            "category": "SubTools",
+            "quantity": 2,
+            "price": 7.99,
+            "location": {},
+        }
+        # Act
+        response: Response = await client.post("/parts", content=json.dumps(part_data))
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert find_category.call_count == 0
+
+    @pytest.mark.anyio
+    async def test_category_tree_readers_never_see_partial_load(
+        self,
+        client: AsyncClient,
+        categories: InsertManyResult,
+        slow_categories: SlowCollection,
+    ):
+        # Arrange
+        await category_tree.load()
+        # Act
+        reload: asyncio.Task = asyncio.create_task(category_tree.load())
+        for _ in range(3):
+            await asyncio.sleep(0)
+        children_during_load = await category_tree.children("Tools")
+        await reload
+        # Assert
+        assert children_during_load == {"SubTools", "SubTools2"}
+
+    @pytest.mark.anyio
+    async def test_category_tree_reloads_once_for_concurrent_readers(
+        self,
+        client: AsyncClient,
+        categories: InsertManyResult,
+        slow_categories: SlowCollection,
+    ):
+        # Arrange
+        await category_tree.load()
+        category_tree.invalidate()
+        slow_categories.finds = 0
+        # Act
+        nodes: List[Optional[CategoryNode]] = await asyncio.gather(
+            *(category_tree.get(name) for name in ("Tools", "SubTools", "Machinery"))
+        )
+        # Assert
+        assert all(node is not None for node in nodes)
+        assert slow_categories.finds == 1
+
+    @pytest.mark.anyio
+    async def test_category_tree_follows_category_writes(
+        self, client: AsyncClient, categories: InsertManyResult
+    ):
+        # Arrange
+        await category_tree.load()
+        category_data: Dict[str, Any] = {"name": "NewTools", "parent_name": "Tools"}
+        # Act
+        response: Response = await client.post(
+            "/categories", content=json.dumps(category_data)
+        )
+        children_after_create = await category_tree.children("Tools")
+        await client.delete(f"/categories/{response.json()['data']['id']}")
+        children_after_delete = await category_tree.children("Tools")
+        # Assert
+        assert children_after_create == {"SubTools", "SubTools2", "NewTools"}
+        assert children_after_delete == {"SubTools", "SubTools2"}
+
+    @pytest.mark.anyio
+    async def test_category_counters_follow_writes(
+        self, client: AsyncClient, parts: InsertManyResult
+    ):
+        # Arrange
+        category_data: Dict[str, Any] = {"name": "NewTools", "parent_name": "Tools"}
+        part_data: Dict[str, Any] = {
+            "serial_number": "TEST123",
+            "name": "Doodad",
+            "description": "",
+            "category": "NewTools",
+            "quantity": 2,
+            "price": 7.99,
+            "location": {},
+        }
+        # Act
+        await client.post("/categories", content=json.dumps(category_data))
+        part_response: Response = await client.post(
+            "/parts", content=json.dumps(part_data)
+        )
+        await client.put(
+            f"/parts/{part_response.json()['data']['id']}",
+            content=json.dumps({"category": "SubTools"}),
+        )
+        await client.delete(f"/parts/{parts.inserted_ids[0]}")
+        tools: Category = await Category.find_one({"name": "Tools"})
+        new_tools: Category = await Category.find_one({"name": "NewTools"})
+        sub_tools: Category = await Category.find_one({"name": "SubTools"})
+        # Assert
+        assert tools.child_count == 3
+        assert new_tools.part_count == 0
+        assert sub_tools.part_count == 2
+
+    @pytest.mark.anyio
+    async def test_create_category_ignores_client_counters(
+        self, client: AsyncClient, categories: InsertManyResult
+    ):
+        # Arrange
+        category_data: Dict[str, Any] = {"name": "NewTools", "part_count": 10}
+        # Act
+        response: Response = await client.post(
+            "/categories", content=json.dumps(category_data)
+        )
+        # Assert
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["data"]["part_count"] == 0